@@ -0,0 +1,94 @@
+"""
+Habit Tracker - Behavioral Science
+
+Immediate TODOs:
+- Improvement 1: Variable micro-reward (rare, post-action)
+- Improvement 2: Event-based habit stacking (one-time input, Contextual cues > temporal cues (Wood & Neal))
+- Improvement 3: Goal conflict acknowledgment (protects motivation)
+- Identity elasticity under failure
+
+CHANGELOG
+---
+
+CHANGES FROM V2:
+
+1. MOVED: Identity to pre-action micro-prime (single line, top)
+   Research: Oyserman (2007, 2015) - identity primes must be brief and pre-decisional.
+   Pre-action primes affect behavior through non-conscious activation.
+   Post-action labels trigger explicit self-evaluation (pressure).
+
+2. ADDED: Sunday obstacle prompt (WOOP completion)
+   Research: Oettingen & Gollwitzer (2010) - implementation intentions double in
+   effectiveness when paired with obstacle identification. MCII/WOOP protocol.
+
+3. REPLACED: Suggested-days (yellow ◦) with streak-to-beat counter
+   Research: Kivetz, Urminsky & Zheng (2006) - goal gradient effect.
+   Garcia & Tor (2009) - self-competition framing avoids social comparison downsides.
+   "1 more = new best" creates endowed progress and clear approaching target.
+
+4. CHANGED: Sort Today panel - struggling habits first
+   Research: Attention primacy, anti-licensing. Completed habits at bottom
+   reduce moral licensing ("I did X so I can skip Y").
+
+5. CHANGED: "✓ done" → "✓ this week"
+   Research: Semantic framing. "Done" sounds like permission to disengage.
+   "This week" is factual without finality.
+
+6. ADDED: First-run "STARTING" state for new users
+   Research: Fogg's Tiny Habits - lower the bar. "First one counts" emphasizes
+   any action creates data.
+
+7. ADDED: Milestone markers at 8/12 weeks for perfect users
+   Research: Lally et al. - 66 days average for automaticity.
+   Fresh start effect works in reverse - people disengage after completing
+   temporal milestones unless given new frame.
+
+8. REMOVED: Dedicated "YOU ARE" section (redundant with inline consistency)
+
+9. CHANGED: Fresh start banner moved to subtle position (end, not top)
+   Research: Only relevant ~14 days/year. Training eye to skip top is bad.
+
+PRESERVED FROM V2:
+- Implementation intentions (Gollwitzer)
+- Recovery mode with self-compassion (Neff)
+- Consistency over streaks (Polivy & Herman)
+- Autonomy-preserving language (Deci & Ryan)
+
+---
+CHANGES FROM V1 (with research citations):
+
+1. REMOVED: MOMENTUM section
+   Why: Sparklines are "dashboard porn" - aesthetically pleasing but behaviorally inert.
+   Knowing you're "declining" doesn't change behavior. (No actionable signal)
+
+2. REMOVED: WEEKLY GOALS section
+   Why: Redundant with TODAY panel. Same information, different visualization.
+
+3. DEMOTED: HISTORY table
+   Why: Reference info, not motivational. Moved to bottom, shows only last 4 weeks.
+
+4. DEMOTED: STREAKS section
+   Why: Overlaps with CONSISTENCY. Now inline with consistency display.
+
+5. ADDED: Implementation intentions (Gollwitzer)
+   Research: Meta-analysis of 94 studies shows d=0.65 effect size for "when X, I will Y" planning.
+   Implementation: Track habit completion times, surface patterns as prompts.
+
+6. ADDED: Identity framing (Clear, Atomic Habits + Bem's self-perception theory)
+   Research: "I'm a runner" > "I'm trying to run". Identity-based motivation is durable.
+   Implementation: Map consistency % to identity labels.
+
+7. ADDED: Fresh start effect (Dai, Milkman, Riis 2014)
+   Research: Goal pursuit increases after temporal landmarks (new week/month/year).
+   Implementation: Detect first run of new period, show forward-looking frame.
+
+8. ADDED: Recovery mode (Neff, Breines & Chen - self-compassion research)
+   Research: Self-criticism after failure REDUCES goal pursuit; self-compassion INCREASES it.
+   Implementation: After 2+ missed weeks, suppress normal display, show compassionate re-entry.
+
+9. CHANGED: "behind" → "restart tomorrow?"
+   Why: SDT (Deci & Ryan) - autonomy matters. External judgment undermines intrinsic motivation.
+
+10. CHANGED: Consistency now primary metric with inline best-streak
+    Why: Polivy & Herman's "what-the-hell effect" - percentages are recoverable, streaks are not.
+"""
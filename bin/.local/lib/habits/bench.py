@@ -0,0 +1,146 @@
+"""
+`habits-streak.py bench`: time parse / patterns / metrics / render on
+synthetic habit files and compare against a saved baseline.
+
+    bench [--sizes=1x3,5x6,20x12] [--repeat=N] [--threshold=PCT] [--save]
+
+Sizes are YEARSxHABITS. Each phase keeps its best of N runs. --save stores
+the results as the baseline; otherwise the run fails (exit 1) when a phase
+is slower than baseline by more than the threshold and BENCH_FLOOR_MS.
+"""
+
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from .cache import load_habits
+from .metrics import compute_metrics
+from .paths import cache_dir
+from .patterns import get_patterns_file, learn_patterns
+from .render import render_dashboard
+from .store import parse_store
+from .synth import redirect_home, synth_goals, synth_habit_text
+
+BENCH_SIZES = [(1, 3), (5, 6), (20, 12)]
+BENCH_REPEAT = 5
+
+# Allowed slowdown vs baseline, as a fraction, and the absolute slack below
+# which differences are treated as timer noise
+BENCH_THRESHOLD = 0.25
+BENCH_FLOOR_MS = 0.5
+
+# Fixed "today" so renders are comparable between runs
+BENCH_TODAY = datetime(2025, 6, 11)
+
+
+def get_baseline_file():
+    return Path(cache_dir()) / "bench-baseline.json"
+
+
+def best_ms(fn, repeat, setup=None):
+    """Best wall time of `repeat` calls after one untimed warm-up, in ms."""
+    if setup:
+        setup()
+    fn()
+    best = float("inf")
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def bench_size(years, n_habits, repeat, workdir):
+    """{phase: ms} for one synthetic file."""
+    goals = synth_goals(n_habits)
+    path = Path(workdir) / f"habits-{years}y-{n_habits}h.md"
+    path.write_text(synth_habit_text(years * 52, goals, seed=years * 100 + n_habits))
+
+    store = parse_store(path)
+    load_habits(path)  # Warm the parse cache
+    metrics = compute_metrics(store, goals)
+    patterns = learn_patterns(store)
+
+    def forget_patterns():
+        get_patterns_file().unlink(missing_ok=True)
+
+    def render(history):
+        return lambda: render_dashboard(
+            store, metrics, patterns, goals, BENCH_TODAY, history
+        )
+
+    return {
+        "parse": best_ms(lambda: parse_store(path), repeat),
+        "parse_cached": best_ms(lambda: load_habits(path), repeat),
+        "patterns": best_ms(lambda: learn_patterns(store), repeat, forget_patterns),
+        "patterns_warm": best_ms(lambda: learn_patterns(store), repeat),
+        "metrics": best_ms(lambda: compute_metrics(store, goals), repeat),
+        "render": best_ms(render(False), repeat),
+        "render_history": best_ms(render(True), repeat),
+    }
+
+
+def parse_sizes(spec):
+    return [tuple(int(n) for n in part.split("x")) for part in spec.split(",")]
+
+
+def main(argv):
+    sizes = BENCH_SIZES
+    repeat = BENCH_REPEAT
+    threshold = BENCH_THRESHOLD
+    save = False
+    for arg in argv:
+        key, _, value = arg.partition("=")
+        if key == "--sizes":
+            sizes = parse_sizes(value)
+        elif key == "--repeat":
+            repeat = int(value)
+        elif key == "--threshold":
+            threshold = float(value) / 100
+        elif key == "--save":
+            save = True
+        else:
+            print(f"  Unknown bench option: {arg}", file=sys.stderr)
+            return 2
+
+    baseline_file = get_baseline_file()
+    try:
+        baseline = json.loads(baseline_file.read_text())
+    except (OSError, ValueError):
+        baseline = {}
+
+    # Cache and patterns files go to a throwaway HOME, not the real ones
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir, redirect_home(workdir):
+        for years, n_habits in sizes:
+            key = f"{years}x{n_habits}"
+            results[key] = bench_size(years, n_habits, repeat, workdir)
+
+    failed = False
+    for key, phases in results.items():
+        years, n_habits = key.split("x")
+        print(f"  {years} years × {n_habits} habits")
+        for phase, ms in phases.items():
+            base = baseline.get(key, {}).get(phase)
+            line = f"    {phase:<15} {ms:9.3f} ms"
+            if base is not None:
+                change = (ms - base) / base if base else 0.0
+                regressed = ms > base * (1 + threshold) and ms - base > BENCH_FLOOR_MS
+                failed = failed or regressed
+                line += f"  {change:+6.0%} vs {base:.3f}"
+                line += "  REGRESSED" if regressed else ""
+            print(line)
+
+    if save:
+        baseline.update(results)
+        baseline_file.parent.mkdir(parents=True, exist_ok=True)
+        baseline_file.write_text(json.dumps(baseline, indent=2))
+        print(f"  Baseline saved to {baseline_file}")
+    elif not baseline:
+        print("  No baseline yet; run with --save to record one")
+    return 1 if failed else 0
@@ -0,0 +1,177 @@
+"""Sidecar parse cache, resumed from the last week header when possible."""
+
+import json
+import os
+import zlib
+from pathlib import Path
+
+from .paths import cache_file_for
+from .store import HEADER_RE, WeekStore, parse_store
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PARSE CACHE: resume from the last week header when the file only grew
+# ═══════════════════════════════════════════════════════════════════════════
+
+CACHE_VERSION = 3
+
+
+def get_cache_file(filepath):
+    """Get path to the parse cache for a habit file."""
+    return Path(cache_file_for(filepath, ".json"))
+
+
+def atomic_write(path, text):
+    """Write via temp file + rename so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(text)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def load_cache(cache_file):
+    try:
+        cache = json.loads(cache_file.read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return None
+    return cache
+
+
+def resume_point(data, last_header):
+    """Where the next parse of a grown file can resume (see can_resume())."""
+    return {
+        "size": len(data),
+        "offset": last_header,
+        "prefix_crc": zlib.crc32(data[:last_header]) if last_header >= 0 else 0,
+    }
+
+
+def header_at(data, offset):
+    """True if the line starting at `offset` is a week header."""
+    end = data.find(b"\n", offset)
+    return bool(HEADER_RE.match(data[offset : end if end >= 0 else None].strip()))
+
+
+def can_resume(data, point):
+    """
+    True if `data` only grew since `point`, everything before its last week
+    header is unchanged and a header still starts there, so parsing can
+    restart from that header.
+    """
+    offset = point["offset"] if point else -1
+    return (
+        offset >= 0
+        and len(data) >= point["size"]
+        and zlib.crc32(data[:offset]) == point["prefix_crc"]
+        and header_at(data, offset)
+    )
+
+
+def load_habits(filepath, use_cache=True, workers=None):
+    """
+    Parse habit file into a WeekStore, reusing a sidecar cache when possible.
+
+    - size + mtime unchanged: cached store, file not read at all
+    - file grew and everything before the last week header is unchanged:
+      keep cached weeks, re-parse from that header onwards
+    - anything else (rewrite, truncation, edit in older weeks): full parse,
+      split across `workers` processes for large files (see parallel.py)
+
+    A directory is read as daily notes instead (see dailynotes.py).
+    """
+    if os.path.isdir(filepath):
+        from .dailynotes import load_daily_notes
+
+        return load_daily_notes(filepath, use_cache)
+
+    if not use_cache:
+        if workers:
+            from .parallel import parse_parallel
+
+            return parse_parallel(filepath, workers)[0]
+        return parse_store(filepath)
+
+    st = os.stat(filepath)
+    cache_file = get_cache_file(filepath)
+    cache = load_cache(cache_file)
+
+    if cache and cache["size"] == st.st_size and cache["mtime_ns"] == st.st_mtime_ns:
+        return WeekStore.from_json(cache["store"])
+
+    with open(filepath, "rb") as f:
+        data = f.read()
+
+    if can_resume(data, cache):
+        store = WeekStore.from_json(cache["store"])
+        store.truncate(len(store) - 1)
+        last_header = store.parse_into(data, cache["offset"])
+    elif workers:
+        from .parallel import parse_parallel
+
+        store, last_header = parse_parallel(filepath, workers)
+    else:
+        store = WeekStore()
+        last_header = store.parse_into(data)
+
+    cache = {
+        "version": CACHE_VERSION,
+        "mtime_ns": st.st_mtime_ns,
+        **resume_point(data, last_header),
+        "store": store.to_json(),
+    }
+    try:
+        atomic_write(cache_file, json.dumps(cache, separators=(",", ":")))
+    except OSError:
+        pass  # Cache is an optimization; a read-only home still works
+
+    return store
+
+
+def patch_cache(filepath, old_stat, offset, tail, n_weeks):
+    """
+    Update the parse cache after the file was rewritten from `offset` to EOF
+    with `tail`, which replaced the file's last `n_weeks` week blocks. Only
+    the tail is parsed; done only when the cache described the file as it
+    was (`old_stat`). Returns the updated store, or None.
+    """
+    cache_file = get_cache_file(filepath)
+    cache = load_cache(cache_file)
+    if not (
+        cache
+        and cache["size"] == old_stat.st_size
+        and cache["mtime_ns"] == old_stat.st_mtime_ns
+    ):
+        return None
+
+    store = WeekStore.from_json(cache["store"])
+    # The rewritten weeks must start with a header, as the cached ones did
+    if n_weeks > len(store) or (n_weeks and not header_at(tail, 0)):
+        return None
+    store.truncate(len(store) - n_weeks)
+    last_header = store.parse_into(tail)
+    if last_header < 0:
+        return None
+    if offset == cache["offset"]:
+        prefix_crc = cache["prefix_crc"]
+    else:
+        # The bytes before `offset` were not rewritten
+        with open(filepath, "rb") as f:
+            prefix_crc = zlib.crc32(f.read(offset))
+    st = os.stat(filepath)
+    cache.update(
+        size=st.st_size,
+        mtime_ns=st.st_mtime_ns,
+        offset=offset + last_header,
+        prefix_crc=zlib.crc32(tail[:last_header], prefix_crc),
+        store=store.to_json(),
+    )
+    try:
+        atomic_write(cache_file, json.dumps(cache, separators=(",", ":")))
+    except OSError:
+        return None
+    return store
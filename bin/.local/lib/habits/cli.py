@@ -0,0 +1,355 @@
+"""
+Command-line entry point.
+
+Only sys/os are imported up front; everything else is imported on the path
+that needs it, so cheap paths (no file, --client, --status) stay cheap.
+"""
+
+import os
+import sys
+
+from . import config
+from .paths import expand_paths
+
+# Subcommands on one habit file, which may come before them the way the
+# shell alias passes it: `habits-streak.py FILE log study`
+FILE_SUBCOMMANDS = ("query", "log")
+
+
+def _dashboard_imports():
+    from .metrics import compute_metrics
+    from .patterns import learn_patterns
+    from .render import write_frame
+
+    return compute_metrics, learn_patterns, write_frame
+
+
+def _load_store(filepaths, use_cache, workers):
+    """One file through its parse cache, or several merged (see merge.py)."""
+    if len(filepaths) == 1:
+        from .cache import load_habits
+
+        return load_habits(filepaths[0], use_cache, workers)
+
+    from .merge import load_merged
+
+    return load_merged(filepaths, use_cache, workers)
+
+
+def _show_dashboard(prof, store, metrics, patterns, goals, today, full_history):
+    """
+    Render and write the dashboard. --history on a terminal goes to $PAGER
+    instead, newest week first, with rows formatted as the pager reads them.
+    """
+    if full_history and sys.stdout.isatty() and len(store) and metrics:
+        from .pager import page, paged_history
+
+        chunks = paged_history(store, metrics, patterns, goals, today)
+        prof.run("write", page, chunks)
+    else:
+        from .render import render_dashboard, write_frame
+
+        text = prof.run(
+            "render",
+            render_dashboard,
+            store,
+            metrics,
+            patterns,
+            goals,
+            today,
+            full_history,
+        )
+        prof.run("write", write_frame, text)
+    prof.finish()
+
+
+def _truncate_as_of(store, day):
+    """
+    --date: everything as of the week containing `day` (binary search on
+    the week start ordinals); later weeks are dropped. True if any were.
+    """
+    as_of = store.week_at(day.toordinal()) + 1 if day else len(store)
+    if as_of >= len(store):
+        return False
+    store.truncate(as_of)
+    return True
+
+
+def _spaced_value(argv, i, consumed, fits):
+    """
+    argv[i + 1] as the value of option argv[i] ("--opt VALUE"), if there is
+    one and `fits` it; its index goes into `consumed` so it is not read as
+    a habit file.
+    """
+    if i + 1 < len(argv) and fits(argv[i + 1]):
+        consumed.add(i + 1)
+        return argv[i + 1]
+    return ""
+
+
+def _is_years(value):
+    """True for a --calendar year list: "2024", "2023,2024", "2022..2024"."""
+    return value.replace("..", ",").replace(",", "").isdigit()
+
+
+def _file_subcommand(argv):
+    """(subcommand, the habit file arguments before it, the rest), or None."""
+    for i, arg in enumerate(argv):
+        if arg.startswith("--"):
+            return None
+        if arg in FILE_SUBCOMMANDS:
+            return arg, argv[:i], argv[i + 1 :]
+    return None
+
+
+def main(started=None):
+    """`started`: launcher's perf_counter() at process start, for --profile."""
+    # Subcommands
+    if sys.argv[1:2] == ["bench"]:
+        from .bench import main as bench_main
+
+        sys.exit(bench_main(sys.argv[2:]))
+    if sys.argv[1:2] == ["oracle"]:
+        from .oracle import main as oracle_main
+
+        sys.exit(oracle_main(sys.argv[2:]))
+    subcommand = _file_subcommand(sys.argv[1:])
+    if subcommand:
+        name, filepaths, rest = subcommand
+        if name == "query":
+            from .index import main as query_main
+
+            sys.exit(query_main(rest, filepaths))
+        from .log import main as log_main
+
+        sys.exit(log_main(rest, filepaths))
+
+    # Parse args
+    show_full_history = "--history" in sys.argv
+    use_cache = "--no-cache" not in sys.argv
+
+    # Date override for testing: --date=YYYY-MM-DD
+    date_override = None
+    client_kind = None
+    startup_budget = None
+    profile_opts = None
+    replay_spec = None
+    calendar_spec = None
+    workers = None
+    argv = sys.argv[1:]
+    consumed = set()  # Indexes of "--opt VALUE" values
+    for i, arg in enumerate(argv):
+        if arg.startswith("--date="):
+            from datetime import datetime
+
+            date_str = arg.split("=")[1]
+            date_override = datetime.strptime(date_str, "%Y-%m-%d")
+        elif arg == "--client" or arg.startswith("--client="):
+            client_kind = arg.partition("=")[2] or "status"
+        elif arg == "--check-startup" or arg.startswith("--check-startup="):
+            startup_budget = arg.partition("=")[2]
+        elif arg == "--profile" or arg.startswith("--profile="):
+            profile_opts = arg.partition("=")[2]
+        elif arg == "--replay" or arg.startswith("--replay="):
+            replay_spec = arg.partition("=")[2] or _spaced_value(
+                argv, i, consumed, lambda v: ".." in v
+            )
+        elif arg == "--calendar" or arg.startswith("--calendar="):
+            # The year list is optional: "--calendar habits.txt" stays a file
+            calendar_spec = arg.partition("=")[2] or _spaced_value(
+                argv, i, consumed, _is_years
+            )
+        elif arg == "--parallel" or arg.startswith("--parallel="):
+            from .parallel import default_workers
+
+            value = arg.partition("=")[2]
+            if value and not (value.isdigit() and int(value) > 0):
+                print(f"  Bad --parallel workers: {value}", file=sys.stderr)
+                sys.exit(2)
+            workers = int(value) if value else default_workers()
+
+    # Cold-start budget check: re-runs this command under -X importtime
+    if startup_budget is not None:
+        from .startup import check_startup
+
+        try:
+            budget_ms = float(startup_budget) if startup_budget else None
+        except ValueError:
+            budget_ms = 0.0
+        if budget_ms is not None and not budget_ms > 0:
+            print(f"  Bad --check-startup budget: {startup_budget}", file=sys.stderr)
+            sys.exit(2)
+        rest = [a for a in sys.argv[1:] if not a.startswith("--check-startup")]
+        sys.exit(check_startup(rest, budget_ms))
+
+    args = [
+        a for j, a in enumerate(argv) if j not in consumed and not a.startswith("--")
+    ]
+    filepaths = expand_paths(args) if args else ["habits.txt"]
+    filepath = filepaths[0]
+    single_file_modes = ("--status", "--serve", "--stream", "--watch")
+    if (len(filepaths) > 1 or os.path.isdir(filepath)) and (
+        client_kind or any(mode in sys.argv for mode in single_file_modes)
+    ):
+        print(
+            "  --status/--serve/--stream/--watch/--client take one habit file",
+            file=sys.stderr,
+        )
+        sys.exit(2)
+
+    # Goals (days per week)
+    goals = config.goals()
+
+    # Ask a running --serve daemon; computed locally if none is listening
+    if client_kind:
+        from .client import DAEMON_KINDS, query_daemon
+
+        if client_kind not in DAEMON_KINDS:
+            print(f"  Unknown --client kind: {client_kind}", file=sys.stderr)
+            sys.exit(2)
+        reply = query_daemon(filepath, client_kind)
+        if reply is not None:
+            sys.stdout.write(reply)
+            return
+
+    # Status-line mode: current week + streak only, read from the file tail
+    if "--status" in sys.argv or client_kind == "status":
+        if os.path.exists(filepath):
+            from .tail import format_status, tail_status
+
+            print(format_status(tail_status(filepath, goals)))
+        return
+
+    missing = [p for p in filepaths if not os.path.exists(p)]
+    if missing:
+        print(f"  No habit file found at: {missing[0]}")
+        print(f"  Create one with format:")  # noqa: F541
+        print(f"    20250101-20250107")  # noqa: F541
+        print(f"    habit_name: Mon 1, Wed 1, Fri 1")  # noqa: F541
+        return
+
+    # TODAY panel for every day in FROM..TO, one NDJSON record per habit
+    if replay_spec is not None:
+        from .export import write_ndjson
+        from .replay import parse_replay_range, replay
+
+        store = _load_store(filepaths, use_cache, workers)
+        try:
+            first, last = parse_replay_range(replay_spec, store)
+        except ValueError as e:
+            print(f"  {e}", file=sys.stderr)
+            sys.exit(2)
+        write_ndjson(replay(store, goals, first, last))
+        return
+
+    if "--serve" in sys.argv:
+        from .daemon import serve
+
+        serve(filepath, goals)
+        return
+
+    # Dashboard kept on screen, repainted on file changes and at midnight
+    if "--watch" in sys.argv:
+        if date_override:
+            print("  --watch always shows today; drop --date", file=sys.stderr)
+            sys.exit(2)
+        from .watch import watch
+
+        watch(filepath, goals, show_full_history)
+        return
+
+    from datetime import datetime
+
+    from .profile import Profiler
+
+    try:
+        prof = Profiler(profile_opts, started)
+    except ValueError as e:
+        print(f"  {e}", file=sys.stderr)
+        sys.exit(2)
+
+    today = date_override if date_override else datetime.now()
+    as_of_day = today if date_override else None
+
+    # --json / --ndjson (and --client=json without a daemon): data only,
+    # the renderer is never imported
+    if "--ndjson" in sys.argv:
+        from .export import week_records, write_ndjson
+
+        store = prof.run("parse", _load_store, filepaths, use_cache, workers)
+        _truncate_as_of(store, as_of_day)
+        prof.run("write", write_ndjson, week_records(store))
+        prof.finish()
+        return
+    if "--json" in sys.argv or client_kind == "json":
+        from .export import snapshot, write_json
+        from .metrics import compute_metrics
+        from .patterns import learn_patterns
+
+        store = prof.run("parse", _load_store, filepaths, use_cache, workers)
+        in_past = _truncate_as_of(store, as_of_day)
+        metrics = prof.run("metrics", compute_metrics, store, goals)
+        patterns = (
+            prof.run("patterns", learn_patterns, store, not in_past)
+            if len(store)
+            else {}
+        )
+        prof.run("write", write_json, snapshot(store, metrics, patterns, today))
+        prof.finish()
+        return
+
+    # Every dashboard phase goes through prof.run(), so --profile covers it
+    compute_metrics, learn_patterns, write_frame = prof.run(
+        "imports", _dashboard_imports
+    )
+    other_view = "--trend" in sys.argv or calendar_spec is not None
+
+    # --stream: one pass, memory bounded by the number of habits; the store
+    # only holds the weeks the history table shows
+    if "--stream" in sys.argv and not other_view:
+        from .stream import stream_dashboard
+
+        until = today.toordinal() if date_override else None
+        store, metrics, patterns = prof.run(
+            "parse", stream_dashboard, filepath, goals, until, show_full_history
+        )
+        _show_dashboard(prof, store, metrics, patterns, goals, today, show_full_history)
+        return
+
+    store = prof.run("parse", _load_store, filepaths, use_cache, workers)
+
+    in_past = _truncate_as_of(store, as_of_day)
+
+    # Rolling-consistency sparklines or calendar heatmaps instead of the
+    # dashboard
+    if other_view:
+        from shutil import get_terminal_size
+
+        width = get_terminal_size().columns
+        if calendar_spec is None:
+            from .trend import render_trend
+
+            text = prof.run("render", render_trend, store, width)
+        else:
+            from .heatmap import parse_years, render_calendar
+
+            try:
+                years = parse_years(calendar_spec, today.year)
+            except ValueError:
+                print(f"  Bad --calendar years: {calendar_spec}", file=sys.stderr)
+                sys.exit(2)
+            text = prof.run("render", render_calendar, store, years, width)
+        prof.run("write", write_frame, text)
+        prof.finish()
+        return
+
+    # All metrics in one pass; all_habits in first-seen order
+    metrics = prof.run("metrics", compute_metrics, store, goals)
+
+    # Learn patterns for implementation intentions; a past view of the file
+    # must not overwrite the saved state for the whole file
+    patterns = (
+        prof.run("patterns", learn_patterns, store, not in_past) if len(store) else {}
+    )
+
+    _show_dashboard(prof, store, metrics, patterns, goals, today, show_full_history)
@@ -0,0 +1,33 @@
+"""Thin client for a running --serve daemon (imports only socket)."""
+
+import os
+import socket
+
+from .paths import cache_file_for
+
+# Reply kinds a client can ask for
+DAEMON_KINDS = ("dashboard", "status", "json")
+
+
+def get_socket_file(filepath):
+    """Get path (str) to the daemon socket for a habit file."""
+    return cache_file_for(filepath, ".sock")
+
+
+def query_daemon(filepath, kind, timeout=0.5):
+    """Ask a running --serve daemon for `kind`; None if none answers."""
+    sock_path = get_socket_file(filepath)
+    if not os.path.exists(sock_path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(timeout)
+            s.connect(sock_path)
+            s.sendall(kind.encode() + b"\n")
+            s.shutdown(socket.SHUT_WR)
+            chunks = []
+            while chunk := s.recv(65536):
+                chunks.append(chunk)
+    except OSError:
+        return None
+    return b"".join(chunks).decode() or None
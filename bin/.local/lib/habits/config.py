@@ -0,0 +1,46 @@
+"""Habit goals, identities, colors and thresholds."""
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CONFIG
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Combined habit configuration - customize as needed
+# identity: (noun, verb_phrase) for micro-prime
+# goal: {"goal": int, "type": "days" or "count"}
+# color: ANSI color code
+HABIT_CONFIG = {
+    "saas": {
+        "identity": ("builders", "build"),
+        "goal": {"goal": 4, "type": "days"},
+        "color": "\033[38;5;208m",  # orange
+    },
+    "study": {
+        "identity": ("learners", "learn"),
+        "goal": {"goal": 5, "type": "days"},
+        "color": "\033[92m",  # green
+    },
+    "tweets": {
+        "identity": ("writers", "write"),
+        "goal": {"goal": 10, "type": "count"},
+        "color": "\033[94m",  # blue
+    },
+}
+
+# Goal for habits not listed in HABIT_CONFIG
+DEFAULT_GOAL = {"goal": 4, "type": "days"}
+
+
+def goals():
+    """{habit: goal} for the configured habits."""
+    return {h: config["goal"] for h, config in HABIT_CONFIG.items()}
+
+
+# Milestone weeks for special recognition
+MILESTONE_WEEKS = [8, 12]
+MILESTONE_MESSAGES = {8: "8 weeks solid", 12: "quarterly habit"}
+
+# Recovery mode threshold: weeks missed to trigger recovery
+RECOVERY_THRESHOLD = 2
+
+# Consistency window: weeks to calculate consistency percentage
+CONSISTENCY_WINDOW = 8
@@ -0,0 +1,183 @@
+"""--serve: keep parsed state warm and answer clients on a Unix socket."""
+
+import json
+import os
+import select
+import signal
+import socket
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from .cache import load_habits
+from .client import DAEMON_KINDS, get_socket_file, query_daemon
+from .export import snapshot
+from .metrics import compute_metrics
+from .patterns import learn_patterns
+from .render import render_dashboard
+from .tail import format_status, tail_status
+
+# ═══════════════════════════════════════════════════════════════════════════
+# RESIDENT DAEMON: --serve keeps parsed state warm behind a Unix socket
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Seconds between stat() checks when inotify is unavailable
+POLL_INTERVAL = 1.0
+
+# inotify(7) event bits
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+
+
+class FileWatcher:
+    """
+    Wait for changes to one file. Uses inotify on the parent directory (so
+    editors that save via rename are seen), else stat() polling.
+    """
+
+    def __init__(self, filepath):
+        self.path = Path(filepath).resolve()
+        self.fd = self._inotify()
+        self.signature = self._stat()
+
+    def _inotify(self):
+        try:
+            import ctypes
+            import ctypes.util
+
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return None  # Not Linux
+        if fd < 0:
+            return None
+        mask = (
+            IN_MODIFY
+            | IN_CLOSE_WRITE
+            | IN_MOVED_FROM
+            | IN_MOVED_TO
+            | IN_CREATE
+            | IN_DELETE
+        )
+        if libc.inotify_add_watch(fd, os.fsencode(self.path.parent), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_ino, st.st_size, st.st_mtime_ns
+
+    @property
+    def timeout(self):
+        """select() timeout: block indefinitely with inotify, else poll."""
+        return None if self.fd is not None else POLL_INTERVAL
+
+    def fileno(self):
+        return self.fd
+
+    def changed(self):
+        """Drain pending events; True if the file differs from last time."""
+        if self.fd is not None:
+            try:
+                while os.read(self.fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+        signature = self._stat()
+        if signature == self.signature:
+            return False
+        self.signature = signature
+        return True
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+
+
+class ServedState:
+    """Parsed habit data and rendered replies, rebuilt only on change."""
+
+    def __init__(self, filepath, goals):
+        self.filepath = filepath
+        self.goals = goals
+        self.refresh()
+
+    def refresh(self):
+        self.store = load_habits(self.filepath)
+        self.metrics = compute_metrics(self.store, self.goals)
+        self.patterns = learn_patterns(self.store) if len(self.store) else {}
+        self.replies = {}
+
+    def reply(self, kind):
+        # The dashboard depends on the weekday, so it is keyed by date
+        today = datetime.now()
+        key = (kind, today.date())
+        if key not in self.replies:
+            if kind == "dashboard":
+                text = render_dashboard(
+                    self.store, self.metrics, self.patterns, self.goals, today
+                )
+            elif kind == "status":
+                # The same reader as --status, so both print the same line;
+                # the store does not keep the current week's line order
+                rows = tail_status(self.filepath, self.goals)
+                text = format_status(rows) + "\n"
+            else:
+                doc = snapshot(self.store, self.metrics, self.patterns, today)
+                text = json.dumps(doc, ensure_ascii=False) + "\n"
+            self.replies = {k: v for k, v in self.replies.items() if k[1] == key[1]}
+            self.replies[key] = text
+        return self.replies[key]
+
+
+def serve(filepath, goals):
+    """Serve dashboard / status / json replies until interrupted."""
+    sock_path = Path(get_socket_file(filepath))
+    if query_daemon(filepath, "status") is not None:
+        print(f"  Already serving {filepath} on {sock_path}", file=sys.stderr)
+        sys.exit(1)
+    sock_path.parent.mkdir(parents=True, exist_ok=True)
+    if sock_path.exists():
+        sock_path.unlink()  # Stale socket from a daemon that died
+
+    state = ServedState(filepath, goals)
+    watcher = FileWatcher(filepath)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(sock_path))
+    server.listen(16)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    mode = "inotify" if watcher.fd is not None else "polling"
+    print(f"  Serving {filepath} on {sock_path} ({mode})", file=sys.stderr)
+
+    try:
+        while True:
+            waiting = [server] if watcher.fd is None else [server, watcher]
+            readable, _, _ = select.select(waiting, [], [], watcher.timeout)
+            if (watcher in readable or watcher.fd is None) and watcher.changed():
+                if os.path.exists(filepath):
+                    state.refresh()
+            if server in readable:
+                conn, _ = server.accept()
+                with conn:
+                    conn.settimeout(0.5)
+                    try:
+                        kind = conn.recv(64).decode().strip() or "status"
+                        if kind in DAEMON_KINDS:
+                            conn.sendall(state.reply(kind).encode())
+                    except OSError:
+                        pass  # Client went away
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        watcher.close()
+        if sock_path.exists():
+            sock_path.unlink()
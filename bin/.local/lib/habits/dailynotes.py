@@ -0,0 +1,179 @@
+"""
+Daily-notes directories as habit sources (one markdown file per day).
+
+A note named like 2024-03-14.md (or 20240314.md) logs habits for that day
+as body lines for configured habits, "study: 1" / "- tweets:: 3", or as a
+frontmatter list:
+
+    ---
+    habits: [study, saas]       or    habits:
+    ---                                 - study
+                                        - tweets: 3
+
+Notes are rolled up into Monday-Sunday weeks in a WeekStore, the same
+shape a weekly habit file parses into; a week without notes between the
+first and last note is an empty week. What each note contributed is kept
+in an index next to the parse caches, keyed by path with (mtime, size), so
+later runs only scan the directory and re-read notes that changed.
+"""
+
+import json
+import os
+import re
+from datetime import date
+from pathlib import Path
+
+from .cache import atomic_write
+from .config import HABIT_CONFIG
+from .paths import cache_file_for
+from .store import DAY_NAMES, WeekStore
+
+INDEX_VERSION = 1
+
+NOTE_NAME_RE = re.compile(r"^(\d{4})-?(\d{2})-?(\d{2})\b.*\.md$")
+BODY_LINE_RE = re.compile(r"^\s*(?:[-*+]\s+)?(\w+)\s*::?\s*(\d+)\s*$", re.M)
+ITEM_RE = re.compile(r"^(\w+)(?:\s*:?\s*(\d+))?$")
+
+
+def get_index_file(dirpath):
+    return Path(cache_file_for(dirpath, ".notes.json"))
+
+
+def parse_item(item, entries):
+    """A frontmatter list item: "study", "study: 2" or "study 2"."""
+    match = ITEM_RE.match(item.strip().strip("\"'"))
+    if match:
+        entries[match.group(1)] = int(match.group(2) or 1)
+
+
+def extract_entries(text, known=HABIT_CONFIG):
+    """{habit: amount} logged in one note; 0 means logged as not done."""
+    entries = {}
+    body = text
+    if text.startswith("---"):
+        end = re.search(r"^(?:---|\.\.\.)\s*$", text[3:], re.M)
+        if end:
+            front = text[3 : 3 + end.start()]
+            body = text[3 + end.end() :]
+            in_list = False
+            for line in front.split("\n"):
+                key, sep, value = line.partition(":")
+                if line.lstrip().startswith("- "):
+                    if in_list:
+                        parse_item(line.lstrip()[2:], entries)
+                    continue
+                in_list = False
+                if not sep:
+                    continue
+                key, value = key.strip(), value.strip()
+                if key == "habits":
+                    if value.startswith("[") and value.endswith("]"):
+                        for item in value[1:-1].split(","):
+                            parse_item(item, entries)
+                    in_list = not value
+                elif key in known and value.isdigit():
+                    entries[key] = int(value)
+
+    for name, amount in BODY_LINE_RE.findall(body):
+        if name in known:
+            entries[name] = int(amount)
+    return entries
+
+
+def scan_notes(dirpath):
+    """(relative path, DirEntry, ordinal) for every dated note, recursively."""
+    stack = [dirpath]
+    while stack:
+        current = stack.pop()
+        try:
+            it = os.scandir(current)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.name.startswith("."):
+                    continue  # .obsidian, .trash, editor temp files
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                    continue
+                match = NOTE_NAME_RE.match(entry.name)
+                if not match:
+                    continue
+                try:
+                    ordinal = date(*map(int, match.groups())).toordinal()
+                except ValueError:
+                    continue
+                yield os.path.relpath(entry.path, dirpath), entry, ordinal
+
+
+def load_index(index_file):
+    try:
+        index = json.loads(index_file.read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+        return {}
+    return index["notes"]
+
+
+def index_notes(dirpath, use_cache=True):
+    """
+    {relative path: [mtime_ns, size, ordinal, entries]}; notes whose mtime
+    and size match the saved index are not opened.
+    """
+    index_file = get_index_file(dirpath)
+    old = load_index(index_file) if use_cache else {}
+    notes = {}
+    changed = False
+    for rel, entry, ordinal in scan_notes(dirpath):
+        try:
+            st = entry.stat()
+        except OSError:
+            continue
+        cached = old.get(rel)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            notes[rel] = cached
+            continue
+        try:
+            with open(entry.path, encoding="utf-8", errors="replace") as f:
+                entries = extract_entries(f.read())
+        except OSError:
+            continue
+        notes[rel] = [st.st_mtime_ns, st.st_size, ordinal, entries]
+        changed = True
+
+    if use_cache and (changed or notes.keys() != old.keys()):
+        index = {"version": INDEX_VERSION, "notes": notes}
+        text = json.dumps(index, separators=(",", ":"))
+        try:
+            atomic_write(index_file, text)
+        except OSError:
+            pass  # The index is an optimization, like the parse cache
+    return notes
+
+
+def load_daily_notes(dirpath, use_cache=True):
+    """WeekStore of Monday-Sunday weeks rolled up from a daily-notes dir."""
+    weeks = {}  # Monday ordinal -> {habit: [day bits, total]}
+    for _, _, ordinal, entries in sorted(
+        index_notes(dirpath, use_cache).values(), key=lambda note: note[2]
+    ):
+        weekday = date.fromordinal(ordinal).weekday()
+        week = weeks.setdefault(ordinal - weekday, {})
+        for h, amount in entries.items():
+            logged = week.setdefault(h, [0, 0])
+            if amount > 0:
+                logged[0] |= 1 << weekday
+                logged[1] += amount
+
+    # Every Monday from the first note to the last, so a week without notes
+    # is an empty week that breaks streaks rather than a missing one
+    store = WeekStore()
+    mondays = range(min(weeks), max(weeks) + 1, 7) if weeks else ()
+    for monday in mondays:
+        first, last = date.fromordinal(monday), date.fromordinal(monday + 6)
+        store.add_week(f"{first:%Y%m%d}-{last:%Y%m%d}")
+        for h, (bits, total) in weeks.get(monday, {}).items():
+            days = [DAY_NAMES[i] for i in range(7) if bits >> i & 1]
+            store.set_entry(h, days, total)
+    return store
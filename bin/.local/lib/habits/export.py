@@ -0,0 +1,107 @@
+"""
+--json / --ndjson: the dashboard's numbers as data, for other tools.
+
+Built from the store, metrics and patterns only; nothing from render.py is
+imported, so a consumer pays for parse + metrics and no drawing. Records
+carry "schema": fields may be added within a version, never renamed or
+removed.
+
+--json    one object: the week as of today and one record per habit
+--ndjson  one line per week of history: that week's logged entries
+"""
+
+import json
+import sys
+from datetime import date
+
+from .metrics import need_priority, today_status
+from .patterns import get_best_days
+from .store import DAY_NAMES
+
+SCHEMA_VERSION = 1
+
+
+def iso_day(ordinal):
+    """ISO date of a week-range ordinal; None for an unparseable range."""
+    return date.fromordinal(ordinal).isoformat() if ordinal > 0 else None
+
+
+def habit_record(h, m, patterns, weekday):
+    """One habit as of `weekday` of the latest week."""
+    if m.recovery:
+        status, remaining, milestone = "recovery", None, None
+    else:
+        status, remaining, milestone = today_status(m, weekday)
+    return {
+        "habit": h,
+        "type": m.type,
+        "goal": m.goal,
+        "done": m.done,
+        "days_done": m.days_done,
+        "total": m.total,
+        "status": status,
+        "remaining": remaining,
+        "milestone": milestone,
+        "streak": m.streak,
+        "best_streak": m.best_streak,
+        "consistency": round(m.consistency),
+        "active_weeks": m.active,
+        "window": m.window,
+        "recovery": m.recovery,
+        "best_days": get_best_days(patterns, h),
+        # The TODAY panel's order: 0 behind / not started, 1 on track, 2 done
+        "priority": need_priority(m.done, m.goal, weekday),
+    }
+
+
+def snapshot(store, metrics, patterns, today):
+    """The --json document: habits in first-seen order."""
+    weekday = today.weekday()
+    return {
+        "schema": SCHEMA_VERSION,
+        "date": today.strftime("%Y-%m-%d"),
+        "week": store.ranges[-1] if len(store) else None,
+        "habits": [habit_record(h, m, patterns, weekday) for h, m in metrics.items()],
+    }
+
+
+def week_records(store):
+    """One --ndjson record per week; habits with nothing logged are left out."""
+    for k, r in enumerate(store.ranges):
+        habits = {}
+        for hid, h in enumerate(store.habits):
+            mask, ndays, total = (
+                store.masks[hid][k],
+                store.ndays[hid][k],
+                store.totals[hid][k],
+            )
+            if mask or ndays or total:
+                habits[h] = {
+                    "days": [d for i, d in enumerate(DAY_NAMES) if mask >> i & 1],
+                    "days_done": ndays,
+                    "total": total,
+                }
+        yield {
+            "schema": SCHEMA_VERSION,
+            "week": r,
+            "start": iso_day(store.starts[k]),
+            "end": iso_day(store.ends[k]),
+            "habits": habits,
+        }
+
+
+def write_json(doc, stream=None):
+    (stream or sys.stdout).write(json.dumps(doc, ensure_ascii=False) + "\n")
+
+
+def write_ndjson(records, stream=None, batch=512):
+    """NDJSON, written in batches of lines."""
+    stream = stream or sys.stdout
+    lines = []
+    for record in records:
+        lines.append(json.dumps(record, ensure_ascii=False))
+        if len(lines) >= batch:
+            stream.write("\n".join(lines) + "\n")
+            lines.clear()
+    if lines:
+        stream.write("\n".join(lines) + "\n")
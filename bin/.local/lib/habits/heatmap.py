@@ -0,0 +1,144 @@
+"""--calendar: year-at-a-glance heatmaps from the per-week day masks."""
+
+from datetime import date
+
+from .render import MONTHS, C, Frame
+
+ROW_LABELS = ["Mon", "   ", "Wed", "   ", "Fri", "   ", "Sun"]
+DONE, MISSED = "■", "·"
+
+# A year spans at most 54 Monday-started week columns; with the row label
+# every year block is BLOCK_WIDTH wide, plus a gap between blocks
+MAX_COLUMNS = 54
+BLOCK_WIDTH = 4 + MAX_COLUMNS
+
+
+def parse_years(spec, default):
+    """Parse "2024", "2023,2024" or "2022..2024" (empty: `default`) to [years]."""
+    if not spec:
+        return [default]
+    first, sep, last = spec.partition("..")
+    if sep:
+        return list(range(int(first), int(last) + 1))
+    return [int(y) for y in spec.split(",")]
+
+
+def year_grid(year):
+    """(ordinal of the Monday on or before Jan 1, number of week columns)."""
+    jan1 = date(year, 1, 1).toordinal()
+    first = jan1 - date.fromordinal(jan1).weekday()
+    last = date(year, 12, 31).toordinal()
+    return first, (last - first) // 7 + 1
+
+
+def year_bits(store, hid, year, first, columns):
+    """
+    Done days of `year` as an int bitset, bit j = day `first + j`. Each
+    week's 7-bit mask (bit 0 = Monday) is rotated to start on the week's
+    first weekday and OR-ed in at its offset.
+    """
+    end = first + columns * 7
+    masks = store.masks[hid]
+    if store.ordered:
+        weeks = range(store.week_at(first - 7) + 1, store.week_at(end) + 1)
+    else:
+        weeks = range(len(store))
+    bits = 0
+    for k in weeks:
+        start = store.starts[k]
+        mask = masks[k]
+        if not (mask and start) or start >= end:
+            continue
+        s = date.fromordinal(start).weekday()
+        days = ((mask >> s) | (mask << (7 - s))) & 0x7F
+        # Days past the week's own end are not part of it
+        length = min(7, store.ends[k] - start + 1) if store.ends[k] else 7
+        days &= (1 << max(0, length)) - 1
+        offset = start - first
+        bits |= days << offset if offset >= 0 else days >> -offset
+
+    # Only this year's days; the first and last columns overlap its neighbours
+    jan1 = date(year, 1, 1).toordinal() - first
+    dec31 = date(year, 12, 31).toordinal() - first
+    return bits & ((1 << (dec31 + 1)) - (1 << jan1))
+
+
+def grid_rows(bits, year, first, columns, hc):
+    """Seven rows of `columns` cells; days outside `year` stay blank."""
+    jan1 = date(year, 1, 1).toordinal() - first
+    dec31 = date(year, 12, 31).toordinal() - first
+    styles = {DONE: hc, MISSED: C.dim, " ": ""}
+    rows = []
+    for r in range(7):
+        cells = []
+        for c in range(columns):
+            j = c * 7 + r
+            if j < jan1 or j > dec31:
+                cells.append(" ")
+            else:
+                cells.append(DONE if bits >> j & 1 else MISSED)
+        rows.append(styled_runs(cells, styles))
+    return rows
+
+
+def styled_runs(cells, styles):
+    """Cells joined with one color escape per run of equal cells."""
+    out = []
+    i = 0
+    while i < len(cells):
+        j = i
+        while j < len(cells) and cells[j] == cells[i]:
+            j += 1
+        run = cells[i] * (j - i)
+        style = styles[cells[i]]
+        out.append(f"{style}{run}{C.reset}" if style else run)
+        i = j
+    return "".join(out)
+
+
+def month_header(year, first, columns):
+    """Month abbreviations over the column holding each month's 1st."""
+    line = [" "] * (columns + 3)
+    for m in range(12):
+        c = (date(year, m + 1, 1).toordinal() - first) // 7
+        line[c : c + 3] = MONTHS[m]  # Months are 4+ columns apart
+    return "".join(line[:columns])
+
+
+def render_calendar(store, years, width=80):
+    """One heatmap per habit, as many years side by side as fit `width`."""
+    out = Frame()
+    out.add()
+    if not store.habits:
+        out.add(f"  {C.dim}No history yet.{C.reset}")
+        out.add()
+        return out.text()
+
+    per_row = max(1, width // (BLOCK_WIDTH + 2))
+    grids = {year: year_grid(year) for year in years}
+
+    for hid, h in enumerate(store.habits):
+        hc = C.h(h)
+        out.add(f"  {hc}▸{C.reset} {h}")
+        for i in range(0, len(years), per_row):
+            chunk = years[i : i + per_row]
+            blocks = []
+            for year in chunk:
+                first, columns = grids[year]
+                bits = year_bits(store, hid, year, first, columns)
+                title = f"{year}  {bin(bits).count('1')} days"
+                months = month_header(year, first, columns)
+                pad = " " * (MAX_COLUMNS - columns)
+                block = [
+                    f"    {C.dim}{title:<{MAX_COLUMNS}}{C.reset}",
+                    f"    {C.dim}{months}{C.reset}{pad}",
+                ]
+                for label, row in zip(
+                    ROW_LABELS, grid_rows(bits, year, first, columns, hc)
+                ):
+                    block.append(f"{C.dim}{label}{C.reset} {row}{pad}")
+                blocks.append(block)
+            for lines in zip(*blocks):
+                out.add("  " + "  ".join(lines).rstrip())
+        out.add()
+    return out.text()
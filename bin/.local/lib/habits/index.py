@@ -0,0 +1,409 @@
+"""
+`habits-streak.py query`: SQL over the whole history via a SQLite index.
+
+    FILE query [--rebuild] rate HABIT [DAY] [YEAR]
+    FILE query [--rebuild] streaks [HABIT]
+    FILE query [--rebuild] metrics
+    FILE query [--rebuild] sql "SELECT ..."
+
+The habit file may also be given after `query` as --file=PATH.
+
+The index is opt-in: it is created next to the parse caches the first time
+`query` runs on a file. The file's size, mtime and CRC are kept in `meta`;
+while they match, a run goes straight to SQL. Otherwise the file is loaded
+through its parse cache and the index synced week by week: a week whose
+content hash is unchanged is left alone, so an appended week costs one week
+of writes.
+
+Tables (weekdays are 0 = Mon, dates are ISO text):
+    habits  (id, name, pos)              pos: first-seen order, NULL if gone
+    weeks   (idx, range, start, end, hash)   idx: position in the file
+    entries (habit, week, mask, ndays, total)   non-empty entries only
+    days    (habit, day, weekday, week)      one row per logged known day
+"""
+
+import os
+import sqlite3
+import sys
+import zlib
+from datetime import date
+
+from . import config
+from .config import CONSISTENCY_WINDOW, DEFAULT_GOAL, RECOVERY_THRESHOLD
+from .export import iso_day
+from .metrics import HabitMetrics
+from .paths import cache_file_for, expand_paths
+from .store import FULL_DAY_NAMES, UNKNOWN_DAY, day_index
+
+INDEX_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS habits (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    pos INTEGER
+);
+CREATE TABLE IF NOT EXISTS weeks (
+    idx INTEGER PRIMARY KEY,
+    range TEXT NOT NULL,
+    start TEXT,
+    end TEXT,
+    hash INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    habit INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    mask INTEGER NOT NULL,
+    ndays INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (habit, week)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS days (
+    habit INTEGER NOT NULL,
+    day TEXT NOT NULL,
+    weekday INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    PRIMARY KEY (habit, day, week)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS weeks_by_start ON weeks (start);
+CREATE INDEX IF NOT EXISTS entries_by_week ON entries (week);
+CREATE INDEX IF NOT EXISTS days_by_day ON days (day, habit);
+CREATE INDEX IF NOT EXISTS days_by_week ON days (week);
+"""
+
+
+def get_index_file(filepath):
+    return cache_file_for(filepath, ".sqlite")
+
+
+def open_index(path):
+    """Connection to the index at `path`, recreated on a version change."""
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+    if row is None or int(row[0]) != INDEX_VERSION:
+        with conn:
+            for table in ("habits", "weeks", "entries", "days"):
+                conn.execute(f"DELETE FROM {table}")
+            conn.execute("DELETE FROM meta WHERE key = 'source'")
+            conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('version', ?)",
+                (str(INDEX_VERSION),),
+            )
+    return conn
+
+
+def week_entries(store, k):
+    """[(habit, mask, ndays, total)] of week k, non-empty entries only."""
+    rows = []
+    for hid, h in enumerate(store.habits):
+        if store.first_week[hid] > k:
+            continue
+        entry = (store.masks[hid][k], store.ndays[hid][k], store.totals[hid][k])
+        if any(entry):
+            rows.append((h, *entry))
+    return rows
+
+
+def week_hash(r, rows):
+    """Content hash of one week block: its range and non-empty entries."""
+    return zlib.crc32(repr((r, rows)).encode())
+
+
+def entry_days(start, end, mask):
+    """(ISO day, weekday) for each day in `mask` within the week start..end."""
+    if start <= 0:
+        return []
+    last = min(start + 6, end) if end >= start else start + 6
+    days = []
+    for ordinal in range(start, last + 1):
+        weekday = date.fromordinal(ordinal).weekday()
+        if mask >> weekday & 1:
+            days.append((iso_day(ordinal), weekday))
+    return days
+
+
+def sync(conn, store):
+    """Bring the index up to date with `store`; returns weeks rewritten."""
+    with conn:
+        known = dict(conn.execute("SELECT name, id FROM habits"))
+        conn.execute("UPDATE habits SET pos = NULL")
+        for pos, h in enumerate(store.habits):
+            if h in known:
+                conn.execute("UPDATE habits SET pos = ? WHERE id = ?", (pos, known[h]))
+            else:
+                cur = conn.execute(
+                    "INSERT INTO habits (name, pos) VALUES (?, ?)", (h, pos)
+                )
+                known[h] = cur.lastrowid
+
+        old = dict(conn.execute("SELECT idx, hash FROM weeks"))
+        rewritten = 0
+        for k, r in enumerate(store.ranges):
+            rows = week_entries(store, k)
+            digest = week_hash(r, rows)
+            if old.get(k) == digest:
+                continue
+            rewritten += 1
+            start, end = store.starts[k], store.ends[k]
+            conn.execute("DELETE FROM entries WHERE week = ?", (k,))
+            conn.execute("DELETE FROM days WHERE week = ?", (k,))
+            conn.execute(
+                "INSERT OR REPLACE INTO weeks VALUES (?, ?, ?, ?, ?)",
+                (k, r, iso_day(start), iso_day(end), digest),
+            )
+            conn.executemany(
+                "INSERT INTO entries VALUES (?, ?, ?, ?, ?)",
+                [(known[h], k, mask, nd, t) for h, mask, nd, t in rows],
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO days VALUES (?, ?, ?, ?)",
+                [
+                    (known[h], day, weekday, k)
+                    for h, mask, _, _ in rows
+                    for day, weekday in entry_days(start, end, mask)
+                ],
+            )
+
+        n = len(store)
+        for table, column in (("weeks", "idx"), ("entries", "week"), ("days", "week")):
+            conn.execute(f"DELETE FROM {table} WHERE {column} >= ?", (n,))
+    return rewritten
+
+
+def sync_file(conn, filepath):
+    """
+    Sync the index from `filepath` unless it was last synced from the same
+    file: same size and mtime, or the same size and CRC after a touch.
+    Daily-notes directories are always synced. Returns weeks rewritten.
+    """
+    if os.path.isdir(filepath):
+        from .cache import load_habits
+
+        return sync(conn, load_habits(filepath))
+
+    # Stat before loading: a write after this is picked up by the next run
+    st = os.stat(filepath)
+    row = conn.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()
+    size, mtime_ns, crc = map(int, row[0].split(":")) if row else (-1, -1, -1)
+    if (size, mtime_ns) == (st.st_size, st.st_mtime_ns):
+        return 0
+    with open(filepath, "rb") as f:
+        digest = zlib.crc32(f.read())
+    rewritten = 0
+    if (size, crc) != (st.st_size, digest):
+        from .cache import load_habits
+
+        rewritten = sync(conn, load_habits(filepath))
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO meta VALUES ('source', ?)",
+            (f"{st.st_size}:{st.st_mtime_ns}:{digest}",),
+        )
+    return rewritten
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# QUERIES
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Runs of consecutive active weeks (gaps and islands): week minus its rank
+# among the habit's active weeks is constant within a run
+RUNS_SQL = """
+WITH active AS (
+    SELECT habit, week,
+           week - ROW_NUMBER() OVER (PARTITION BY habit ORDER BY week) AS run
+    FROM entries WHERE ndays > 0
+)
+SELECT habit, COUNT(*) AS length, MAX(week) AS last
+FROM active GROUP BY habit, run
+"""
+
+
+def index_metrics(conn, goals, window=CONSISTENCY_WINDOW, threshold=RECOVERY_THRESHOLD):
+    """compute_metrics() answered from the index: {habit: HabitMetrics}."""
+    n = conn.execute("SELECT COUNT(*) FROM weeks").fetchone()[0]
+    recent = n - min(window, n) if window > 0 else n
+    rows = conn.execute(
+        f"""
+        WITH runs AS ({RUNS_SQL})
+        SELECT h.name,
+            (SELECT COALESCE(MAX(length), 0) FROM runs WHERE habit = h.id),
+            (SELECT COALESCE(MAX(length), 0) FROM runs
+             WHERE habit = h.id AND last = :last),
+            (SELECT COUNT(*) FROM entries
+             WHERE habit = h.id AND ndays > 0 AND week >= :recent),
+            (SELECT COUNT(*) FROM entries
+             WHERE habit = h.id AND ndays > 0 AND week >= :quiet),
+            (SELECT ndays FROM entries WHERE habit = h.id AND week = :last),
+            (SELECT total FROM entries WHERE habit = h.id AND week = :last)
+        FROM habits h WHERE h.pos IS NOT NULL ORDER BY h.pos
+        """,
+        {"last": n - 1, "recent": recent, "quiet": n - threshold},
+    )
+    metrics = {}
+    for h, best, streak, active, lately, ndays, total in rows:
+        m = HabitMetrics()
+        m.streak = streak
+        m.best_streak = best
+        m.active = active
+        m.window = n - recent
+        m.recovery = n >= threshold and not lately
+        m.days_done = ndays or 0
+        m.total = total or 0
+        goal_info = goals.get(h, DEFAULT_GOAL)
+        m.goal = goal_info["goal"]
+        m.type = goal_info["type"]
+        metrics[h] = m
+    return metrics
+
+
+def completion_rate(conn, habit, weekday=None, year=None):
+    """(days done, days covered by weeks) for a habit, weekday and year."""
+    where, args = [], []
+    if year is not None:
+        where.append("day BETWEEN ? AND ?")
+        args += [f"{year}-01-01", f"{year}-12-31"]
+    if weekday is not None:
+        where.append("weekday = ?")
+        args.append(weekday)
+    done = conn.execute(
+        "SELECT COUNT(DISTINCT day) FROM days"
+        " WHERE habit = (SELECT id FROM habits WHERE name = ?)"
+        + "".join(f" AND {w}" for w in where),
+        [habit, *args],
+    ).fetchone()[0]
+
+    # Days the file covers: every day of every week, counted once
+    weeks = "SELECT start, end FROM weeks WHERE start IS NOT NULL"
+    args = []
+    if year is not None:
+        weeks += " AND start BETWEEN ? AND ?"
+        args = [f"{year - 1}-12-26", f"{year}-12-31"]
+    covered = set()
+    for start, end in conn.execute(weeks, args):
+        first = date.fromisoformat(start).toordinal()
+        last = date.fromisoformat(end).toordinal() if end else first + 6
+        if last < first:
+            last = first + 6
+        for ordinal in range(first, min(last, first + 6) + 1):
+            day = date.fromordinal(ordinal)
+            if (year is None or day.year == year) and (
+                weekday is None or day.weekday() == weekday
+            ):
+                covered.add(ordinal)
+    return done, len(covered)
+
+
+def yearly_streaks(conn, habit=None):
+    """[(habit, year, longest run of active weeks starting in that year)]."""
+    return conn.execute(
+        """
+        WITH active AS (
+            SELECT e.habit, substr(w.start, 1, 4) AS year, e.week,
+                   e.week - ROW_NUMBER() OVER (
+                       PARTITION BY e.habit, substr(w.start, 1, 4) ORDER BY e.week
+                   ) AS run
+            FROM entries e JOIN weeks w ON w.idx = e.week
+            WHERE e.ndays > 0 AND w.start IS NOT NULL
+        ), runs AS (
+            SELECT habit, year, COUNT(*) AS length FROM active
+            GROUP BY habit, year, run
+        )
+        SELECT h.name, runs.year, MAX(runs.length)
+        FROM runs JOIN habits h ON h.id = runs.habit
+        WHERE ? IS NULL OR h.name = ?
+        GROUP BY h.id, runs.year ORDER BY h.pos, runs.year
+        """,
+        (habit, habit),
+    ).fetchall()
+
+
+def print_table(header, rows):
+    rows = [["" if v is None else str(v) for v in row] for row in rows]
+    widths = [max([len(h)] + [len(r[i]) for r in rows]) for i, h in enumerate(header)]
+    for row in [header] + rows:
+        print("  " + "  ".join(v.ljust(w) for v, w in zip(row, widths)).rstrip())
+
+
+def main(argv, filepaths=()):
+    """`filepaths`: habit file arguments given before the subcommand."""
+    filepaths = list(filepaths)
+    rebuild = False
+    args = []
+    for arg in argv:
+        key, _, value = arg.partition("=")
+        if key == "--file":
+            filepaths.append(value)
+        elif key == "--rebuild":
+            rebuild = True
+        elif arg.startswith("--"):
+            print(f"  Unknown query option: {arg}", file=sys.stderr)
+            return 2
+        else:
+            args.append(arg)
+    kinds = ("rate", "streaks", "metrics", "sql")
+    if not args or args[0] not in kinds:
+        print(f"  query wants one of: {', '.join(kinds)}", file=sys.stderr)
+        return 2
+    filepaths = expand_paths(filepaths)
+    if len(filepaths) != 1:
+        print("  query takes one habit file: FILE query ...", file=sys.stderr)
+        return 2
+
+    filepath = filepaths[0]
+    if not os.path.exists(filepath):
+        print(f"  No habit file found at: {filepath}", file=sys.stderr)
+        return 1
+    index_file = get_index_file(filepath)
+    if rebuild and os.path.exists(index_file):
+        os.remove(index_file)
+    os.makedirs(os.path.dirname(index_file), exist_ok=True)
+    conn = open_index(index_file)
+    sync_file(conn, filepath)
+
+    kind, rest = args[0], args[1:]
+    try:
+        if kind == "rate":
+            habit = rest[0]
+            weekday = year = None
+            for value in rest[1:]:
+                if value.isdigit():
+                    year = int(value)
+                else:
+                    weekday = day_index(value)
+                    if weekday is UNKNOWN_DAY:
+                        raise ValueError(f"not a day: {value}")
+            done, covered = completion_rate(conn, habit, weekday, year)
+            scope = habit
+            if weekday is not None:
+                scope += f" on {FULL_DAY_NAMES[weekday].title()}s"
+            if year is not None:
+                scope += f" in {year}"
+            rate = done / covered if covered else 0
+            print(f"  {scope}: {done}/{covered} days ({rate:.0%})")
+        elif kind == "streaks":
+            rows = yearly_streaks(conn, rest[0] if rest else None)
+            print_table(["habit", "year", "best streak (weeks)"], rows)
+        elif kind == "metrics":
+            goals = config.goals()
+            metrics = index_metrics(conn, goals)
+            rows = [
+                (h, m.streak, m.best_streak, f"{m.active}/{m.window}", m.recovery)
+                for h, m in metrics.items()
+            ]
+            print_table(["habit", "streak", "best", "active", "recovery"], rows)
+        else:
+            # Raw SQL on a read-only connection
+            ro = sqlite3.connect(f"file:{index_file}?mode=ro", uri=True)
+            cur = ro.execute(" ".join(rest))
+            header = [d[0] for d in cur.description or []]
+            print_table(header, cur.fetchall())
+    except IndexError:
+        print(f"  query {kind}: missing arguments", file=sys.stderr)
+        return 2
+    except (ValueError, sqlite3.Error) as e:
+        print(f"  query {kind}: {e}", file=sys.stderr)
+        return 2
+    return 0
@@ -0,0 +1,227 @@
+"""
+`habits-streak.py log`: record a habit without opening the file.
+
+    FILE log HABIT [--date=YYYY-MM-DD] [--count=N]
+    log HABIT [--date=YYYY-MM-DD] [--count=N] --file=FILE
+
+Adds N (default 1) on the date's weekday to the habit's line in the week
+that contains the date: "study: Mon 1" becomes "study: Mon 1, Tue 1", and
+logging Tuesday again makes it "Tue 2"; a bare total, "tweets: 4", becomes
+"tweets: 5". A date after the last week starts a new week at the end of the
+file, in the file's own 7-day weeks and after the same gap as the week
+before it.
+
+The week is found by reading back from EOF, and only the file from that
+week's header on is rewritten, under an exclusive flock() so concurrent
+`log` runs queue up. When the parse cache matched the file before the
+write, it is patched with the re-parsed tail, and the learned patterns are
+brought up to date from it, instead of both being left to go stale.
+"""
+
+import fcntl
+import os
+import sys
+from datetime import date, timedelta
+from itertools import chain
+
+from .paths import expand_paths
+from .store import (
+    DAY_NAMES,
+    ENTRY_RE,
+    day_index,
+    range_end_ordinal,
+    range_start_ordinal,
+)
+from .tail import week_blocks_reversed
+
+
+def week_range(start):
+    """YYYYMMDD-YYYYMMDD of the 7 days from ordinal `start`."""
+    first = date.fromordinal(start)
+    return f"{first:%Y%m%d}-{first + timedelta(days=6):%Y%m%d}"
+
+
+def week_header(day):
+    return week_range(day.toordinal() - day.weekday())
+
+
+def entry_lines(block):
+    """(line number, line) of each habit line of a block's text."""
+    for i, line in enumerate(block.split("\n")[1:], 1):
+        stripped = line.strip()
+        if stripped and not stripped.startswith("#") and ":" in stripped:
+            yield i, line
+
+
+def block_indent(blocks):
+    """Indent of the first habit line in `blocks` (bytes); "" if none has one."""
+    for raw in blocks:
+        for _, line in entry_lines(raw.decode()):
+            return line[: len(line) - len(line.lstrip())]
+    return ""
+
+
+def add_to_block(block, habit, weekday, count, indent=""):
+    """
+    (new block text, the habit's new value) with `count` added on
+    `weekday`, or to the total of a line that is a bare total. The last line
+    for the habit is the one edited, since later lines win; without one, a
+    line is added after the block's last entry, indented like it (or by
+    `indent` in a block with no entries).
+    """
+    lines = block.split("\n")
+    target = None
+    last_entry = 0
+    for i, line in entry_lines(block):
+        if last_entry == 0:
+            indent = line[: len(line) - len(line.lstrip())]
+        last_entry = i
+        if line.split(":", 1)[0].strip() == habit:
+            target = i
+
+    if target is None:
+        value = f"{DAY_NAMES[weekday]} {count}"
+        lines.insert(last_entry + 1, f"{indent}{habit}: {value}")
+        return "\n".join(lines), value
+
+    name, value = lines[target].split(":", 1)
+    value = value.strip()
+    if value.isdigit() and value != "0":
+        # A bare weekly total ("tweets: 4") stays one
+        value = str(int(value) + count)
+        lines[target] = f"{name}: {value}"
+        return "\n".join(lines), value
+    parts = [] if value == "0" else [p.strip() for p in value.split(",")]
+    for j, part in enumerate(parts):
+        match = ENTRY_RE.match(part)
+        if match and day_index(match.group(1)) == weekday:
+            parts[j] = f"{match.group(1)} {int(match.group(2)) + count}"
+            break
+    else:
+        parts.append(f"{DAY_NAMES[weekday]} {count}")
+    value = ", ".join(p for p in parts if p)
+    lines[target] = f"{name}: {value}"
+    return "\n".join(lines), value
+
+
+def log_entry(filepath, habit, day, count=1):
+    """
+    Add the entry under an exclusive lock; returns (week range, new value).
+    Raises ValueError when the date is before the last week but in no week
+    of the file.
+    """
+    ordinal = day.toordinal()
+    with open(filepath, "r+b") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        old_stat = os.fstat(f.fileno())
+
+        later = []  # Blocks after the target week, newest first
+        blocks = week_blocks_reversed(f)
+        for offset, raw in blocks:
+            header = raw.split(b"\n", 1)[0].strip().decode()
+            start, end = range_start_ordinal(header), range_end_ordinal(header)
+            if start <= ordinal <= end:
+                earlier = (b for _, b in blocks)
+                indent = block_indent(chain(later, earlier))
+                block, value = add_to_block(
+                    raw.decode(), habit, day.weekday(), count, indent
+                )
+                tail = block.encode() + b"".join(reversed(later))
+                n_weeks = 1 + len(later)
+                break
+            if ordinal > end:
+                if later:
+                    raise ValueError(f"no week in {filepath} contains {day}")
+                # After the last week: the week of the file's 7-day grid
+                # that holds the date, set off the way the last week is
+                start = end + 1 if end else ordinal - day.weekday()
+                header = week_range(start + (ordinal - start) // 7 * 7)
+                previous = next(blocks, (None, b""))[1]
+                gap = previous[len(previous.rstrip()) :] or b"\n\n"
+                earlier = (b for _, b in blocks)
+                indent = block_indent(chain([raw, previous], earlier))
+                block, value = add_to_block(header, habit, day.weekday(), count, indent)
+                tail = raw.rstrip() + gap + block.encode()
+                n_weeks = 1
+                break
+            later.append(raw)
+        else:
+            if later:
+                raise ValueError(f"no week in {filepath} contains {day}")
+            # No week yet: the first header goes at the end of the file
+            offset = old_stat.st_size
+            header = week_header(day)
+            block, value = add_to_block(header, habit, day.weekday(), count)
+            tail = block.encode()
+            n_weeks = 0
+            if offset:
+                f.seek(offset - 1)
+                tail = (b"\n" if f.read(1) == b"\n" else b"\n\n") + tail
+        if not tail.endswith(b"\n"):
+            tail += b"\n"
+
+        f.seek(offset)
+        f.write(tail)
+        f.truncate()
+        f.flush()
+
+        _patch_caches(filepath, old_stat, offset, tail, n_weeks)
+    return header, value
+
+
+def _patch_caches(filepath, old_stat, offset, tail, n_weeks):
+    """Parse cache and learned patterns, updated from the rewritten tail."""
+    from .cache import patch_cache
+
+    store = patch_cache(filepath, old_stat, offset, tail, n_weeks)
+    if store is not None and len(store):
+        from .patterns import learn_patterns
+
+        learn_patterns(store)
+
+
+def main(argv, filepaths=()):
+    """`filepaths`: habit file arguments given before the subcommand."""
+    filepaths = list(filepaths)
+    day = date.today()
+    count = 1
+    habits = []
+    args = iter(argv)
+    for arg in args:
+        key, sep, value = arg.partition("=")
+        if key in ("--date", "--count", "--file") and not sep:
+            value = next(args, "")
+        try:
+            if key == "--date":
+                day = date.fromisoformat(value)
+            elif key == "--count":
+                count = int(value)
+            elif key == "--file":
+                filepaths.append(value)
+            elif arg.startswith("--"):
+                print(f"  Unknown log option: {arg}", file=sys.stderr)
+                return 2
+            else:
+                habits.append(arg)
+        except ValueError:
+            print(f"  Bad value for {key}: {value!r}", file=sys.stderr)
+            return 2
+    filepaths = expand_paths(filepaths)
+    if len(habits) != 1 or count < 1 or len(filepaths) != 1:
+        print(
+            "  usage: FILE log HABIT [--date=YYYY-MM-DD] [--count=N]",
+            file=sys.stderr,
+        )
+        return 2
+    filepath = filepaths[0]
+    if not os.path.isfile(filepath):
+        print(f"  No habit file found at: {filepath}", file=sys.stderr)
+        return 1
+
+    try:
+        r, value = log_entry(filepath, habits[0], day, count)
+    except ValueError as e:
+        print(f"  {e}", file=sys.stderr)
+        return 1
+    print(f"  {r}  {habits[0]}: {value}")
+    return 0
@@ -0,0 +1,90 @@
+"""
+Several habit files (per context, per year, ...) as one WeekStore.
+
+Each file is loaded through its own parse cache, concurrently, so only
+changed files are re-read. Weeks with the same range are merged and all
+weeks are put in date order, so streaks run on across file boundaries.
+A habit with different non-empty entries for the same week in two files
+is a conflict: it is reported and the later file on the command line wins,
+like a later line within one file.
+"""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from .cache import load_habits
+from .store import DAY_NAMES, WeekStore, range_start_ordinal
+
+MAX_LOAD_THREADS = 8
+MAX_CONFLICTS_SHOWN = 10
+
+
+def merge_stores(stores, labels):
+    """
+    (merged WeekStore, conflicts). A conflict is
+    (range, habit, (label, mask, ndays, total) kept, (label, ...) overridden).
+    """
+    sources = {}  # range -> [(store index, week index)] in argument order
+    for si, store in enumerate(stores):
+        for wi, r in enumerate(store.ranges):
+            sources.setdefault(r, []).append((si, wi))
+
+    merged = WeekStore()
+    conflicts = []
+    for r in sorted(sources, key=range_start_ordinal):
+        merged.add_week(r)
+        values = {}  # habit -> (store index, (mask, ndays, total))
+        for si, wi in sources[r]:
+            store = stores[si]
+            for hid, h in enumerate(store.habits):
+                if store.first_week[hid] > wi:
+                    continue
+                if store.first_week[hid] == wi:
+                    merged.intern(h)  # Even if only ever logged as 0
+                entry = (
+                    store.masks[hid][wi],
+                    store.ndays[hid][wi],
+                    store.totals[hid][wi],
+                )
+                if not any(entry):
+                    continue
+                prev = values.get(h)
+                if prev is not None and prev[1] != entry:
+                    conflicts.append(
+                        (r, h, (labels[si], *entry), (labels[prev[0]], *prev[1]))
+                    )
+                values[h] = (si, entry)
+        for h, (_, entry) in values.items():
+            merged.set_values(h, *entry)
+    return merged, conflicts
+
+
+def file_labels(filepaths):
+    """Base names, or full paths where base names collide."""
+    names = [os.path.basename(p) for p in filepaths]
+    return [p if names.count(n) > 1 else n for p, n in zip(filepaths, names)]
+
+
+def describe(entry):
+    """'a.md (Mon Wed, 2)': the file, its logged days and its total."""
+    label, mask, ndays, total = entry
+    days = " ".join(d for i, d in enumerate(DAY_NAMES) if mask >> i & 1)
+    return f"{label} ({days or 'undated'}, {total})"
+
+
+def load_merged(filepaths, use_cache=True, workers=None, stream=None):
+    """Load every file (each with its own cache) and merge; warns on conflicts."""
+    threads = min(MAX_LOAD_THREADS, len(filepaths))
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        stores = list(pool.map(lambda p: load_habits(p, use_cache, workers), filepaths))
+    store, conflicts = merge_stores(stores, file_labels(filepaths))
+
+    if conflicts:
+        stream = stream or sys.stderr
+        stream.write(f"  {len(conflicts)} conflicting entries (later file wins):\n")
+        for r, h, kept, lost in conflicts[:MAX_CONFLICTS_SHOWN]:
+            stream.write(f"    {r}  {h}: {describe(kept)} over {describe(lost)}\n")
+        if len(conflicts) > MAX_CONFLICTS_SHOWN:
+            stream.write(f"    ... and {len(conflicts) - MAX_CONFLICTS_SHOWN} more\n")
+    return store
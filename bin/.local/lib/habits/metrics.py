@@ -0,0 +1,128 @@
+"""Streaks, consistency, recovery state and sort priority."""
+
+from .config import (
+    CONSISTENCY_WINDOW,
+    DEFAULT_GOAL,
+    MILESTONE_MESSAGES,
+    RECOVERY_THRESHOLD,
+)
+
+# ═══════════════════════════════════════════════════════════════════════════
+# METRICS
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+class HabitMetrics:
+    """Per-habit numbers the dashboard reads, computed together."""
+
+    __slots__ = (
+        "streak",
+        "best_streak",
+        "active",
+        "window",
+        "recovery",
+        "days_done",
+        "total",
+        "goal",
+        "type",
+    )
+
+    @property
+    def done(self):
+        """Progress this week in the unit of the goal."""
+        return self.total if self.type == "count" else self.days_done
+
+    @property
+    def completed(self):
+        return self.done >= self.goal
+
+    @property
+    def consistency(self):
+        return (self.active / self.window * 100) if self.window > 0 else 0
+
+
+def compute_metrics(
+    store, goals, window=CONSISTENCY_WINDOW, threshold=RECOVERY_THRESHOLD, hids=None
+):
+    """
+    One activity vector per habit (from the WeekStore columns), then
+    streak / best streak / consistency / recovery / goal progress from it.
+    Returns {habit: HabitMetrics} in first-seen order (same as all_habits);
+    `hids` limits it to those habit ids.
+    """
+    n = len(store)
+    metrics = {}
+    for hid in range(len(store.habits)) if hids is None else hids:
+        h = store.habits[hid]
+        vec = store.activity(hid)
+        # Runs of active weeks: the last run is the current streak
+        runs = vec.split(b"\x00")
+        m = HabitMetrics()
+        m.streak = len(runs[-1])
+        m.best_streak = max(map(len, runs))
+        recent = vec[-window:] if window > 0 else b""
+        m.active = sum(recent)
+        m.window = len(recent)
+        m.recovery = n >= threshold and not any(vec[n - threshold :])
+        m.days_done = store.ndays[hid][-1] if n else 0
+        m.total = store.totals[hid][-1] if n else 0
+        goal_info = goals.get(h, DEFAULT_GOAL)
+        m.goal = goal_info["goal"]
+        m.type = goal_info["type"]
+        metrics[h] = m
+    return metrics
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# TODAY PANEL STATUS
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+def today_status(m, weekday):
+    """
+    What the TODAY panel says for one habit: (status, remaining, milestone).
+
+    status is "done", "new_best" (finishing the week beats the best streak),
+    "ties_best", "to_go" or "restart" (more days left to do than days left
+    in the week). milestone is the note shown after a completed week, or None.
+    Research: Kivetz (goal gradient), Garcia & Tor (self-competition)
+    """
+    milestone = None
+    if m.completed:
+        if m.streak in MILESTONE_MESSAGES:
+            milestone = MILESTONE_MESSAGES[m.streak]
+        elif m.streak > 12 and m.streak % 4 == 0:
+            milestone = f"{m.streak}w"
+        return "done", 0, milestone
+    if m.type == "count":
+        return "to_go", m.goal - m.total, None
+
+    remaining = m.goal - m.days_done
+    if remaining > 6 - weekday:
+        return "restart", remaining, None
+    # The streak counts completed weeks, so finishing this one makes it +1
+    if m.best_streak > 0 and m.streak + 1 > m.best_streak:
+        return "new_best", remaining, None
+    if m.best_streak > 0 and m.streak + 1 == m.best_streak:
+        return "ties_best", remaining, None
+    return "to_go", remaining, None
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SORTING: Struggling habits first (anti-licensing)
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+def need_priority(done, goal, weekday):
+    """0 = not started / behind, 1 = on track, 2 = completed."""
+    if done >= goal:
+        return 2  # Completed - show last
+    elif done == 0:
+        return 0  # Not started - show first
+    else:
+        # Partial - sort by how far behind
+        remaining = goal - done
+        days_left = 6 - weekday
+        if remaining > days_left:
+            return 0  # Behind schedule - show first
+        return 1  # On track - middle
@@ -0,0 +1,422 @@
+"""
+`habits-streak.py oracle`: diff the real engine against habits.reference on
+randomized habit files.
+
+    oracle [--files=N] [--dates=N] [--weeks=N] [--seed=S]
+
+For each synthetic file this checks, against the frozen reference:
+  - week ranges and the first-seen habit order,
+  - the single-pass compute_metrics() numbers for every habit against
+    get_streak / get_best_streak / get_consistency / is_recovery_mode,
+  - PrefixSums window counts against get_consistency() for many windows,
+  - need_priority() order against sort_habits_by_need() for every weekday,
+  - full dashboards (with and without --history) for N --date values, from
+    --no-cache, --stream, a cold cache, a warm cache and a cache resumed after
+    the file grew from a truncated copy, and from the file split into
+    one file per year (passed newest first, so merging must sort them). The
+    reference sees the file cut before the first week that starts after the
+    date, found by a linear scan,
+  - --replay records against compute_metrics() run separately per day,
+  - the SQLite index: index_metrics() against compute_metrics(), and an
+    index synced from half the file and then all of it, or from the file
+    and again after a touch, against a fresh one.
+  - `log`: after entries are logged into the last week and a new one, the
+    patched parse cache and patterns against a fresh parse of the file.
+Any difference is printed as a diff and the run exits 1.
+"""
+
+import difflib
+import io
+import os
+import random
+import re
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from datetime import date, timedelta
+from pathlib import Path
+
+from . import cli, config, index, log, metrics, patterns, reference, replay, store
+from .cache import load_habits
+from .synth import SYNTH_START, redirect_home, synth_goals, synth_habit_text
+from .trend import PrefixSums
+
+ORACLE_FILES = 40
+ORACLE_DATES = 6
+ORACLE_MAX_WEEKS = 160
+ORACLE_REPLAY_DAYS = 45
+
+# Dates every file is rendered for: each fresh-start kind and both ends of
+# the week, on top of the random ones
+ORACLE_FIXED_DATES = ["2025-01-01", "2025-06-01", "2025-06-02", "2025-06-08"]
+
+MAX_FAILURES = 5
+
+HEADER_LINE_RE = re.compile(r"^\d{8}-\d{8}$")
+
+
+def text_as_of(text, day):
+    """`text` up to the header of the first week after the one `day` is in."""
+    target = date.fromisoformat(day).toordinal()
+    headers = []
+    offset = 0
+    for line in text.split("\n"):
+        stripped = line.strip()
+        if HEADER_LINE_RE.match(stripped):
+            try:
+                start = date(
+                    int(stripped[:4]), int(stripped[4:6]), int(stripped[6:8])
+                ).toordinal()
+            except ValueError:
+                start = 0
+            headers.append((offset, start))
+        offset += len(line) + 1
+    containing = -1
+    for i, (_, start) in enumerate(headers):
+        if start <= target and (containing < 0 or start >= headers[containing][1]):
+            containing = i
+    if containing + 1 < len(headers):
+        return text[: headers[containing + 1][0]]
+    return text
+
+
+def capture(main, argv):
+    """stdout of `main()` run with sys.argv = argv."""
+    buf = io.StringIO()
+    saved = sys.argv
+    sys.argv = argv
+    try:
+        with redirect_stdout(buf):
+            main()
+    finally:
+        sys.argv = saved
+    return buf.getvalue()
+
+
+class Oracle:
+    """Runs the checks for one file and collects mismatches."""
+
+    def __init__(self, workdir):
+        self.workdir = Path(workdir)
+        self.ref_home = self.workdir / "ref-home"
+        self.new_home = self.workdir / "new-home"
+        self.ref_home.mkdir()
+        self.new_home.mkdir()
+        self.failures = []
+        self.checks = 0
+
+    def expect(self, what, expected, got):
+        self.checks += 1
+        if expected == got:
+            return
+        if isinstance(expected, str) and isinstance(got, str):
+            diff = difflib.unified_diff(
+                expected.splitlines(),
+                got.splitlines(),
+                "reference",
+                "engine",
+                lineterm="",
+            )
+            detail = "\n".join(diff)
+        else:
+            detail = f"  reference: {expected!r}\n  engine:    {got!r}"
+        self.failures.append(f"{what}\n{detail}")
+
+    def check_functions(self, label, path):
+        """compute_metrics() and need_priority() against the reference."""
+        weeks = reference.parse_habits(path)
+        goals = config.goals()
+        with redirect_home(self.new_home):
+            columns = load_habits(path, use_cache=False)
+        self.expect(
+            f"{label}: week ranges", [w["range"] for w in weeks], columns.ranges
+        )
+        computed = metrics.compute_metrics(columns, goals)
+        all_habits = list(dict.fromkeys(h for w in weeks for h in w["habits"]))
+        self.expect(f"{label}: habit order", all_habits, list(computed))
+
+        for h in all_habits:
+            expected = (
+                reference.get_streak(weeks, h),
+                reference.get_best_streak(weeks, h),
+                reference.get_consistency(weeks, h),
+                reference.is_recovery_mode(weeks, h),
+            )
+            m = computed.get(h)
+            single_pass = m and (
+                m.streak,
+                m.best_streak,
+                (m.active, m.window),
+                m.recovery,
+            )
+            self.expect(f"{label}: compute_metrics for {h}", expected, single_pass)
+
+        sums = PrefixSums(columns)
+        for hid, h in enumerate(columns.habits):
+            self.expect(
+                f"{label}: PrefixSums windows for {h}",
+                [reference.get_consistency(weeks, h, w) for w in range(1, 60)],
+                [
+                    (sums.active_weeks(hid, len(columns), w), min(w, len(columns)))
+                    for w in range(1, 60)
+                ],
+            )
+
+        current = weeks[-1] if weeks else None
+        for weekday in range(7):
+            need = {
+                h: metrics.need_priority(m.done, m.goal, weekday)
+                for h, m in computed.items()
+            }
+            self.expect(
+                f"{label}: need_priority order weekday={weekday}",
+                reference.sort_habits_by_need(all_habits, current, goals, weekday),
+                sorted(all_habits, key=need.get),
+            )
+
+    def check_replay(self, label, path, first):
+        """Incremental --replay against per-day truncate + compute_metrics."""
+        goals = config.goals()
+        last = first + ORACLE_REPLAY_DAYS - 1
+        got = list(replay.replay(store.parse_store(path), goals, first, last))
+        expected = []
+        for ordinal in range(first, last + 1):
+            past = store.parse_store(path)
+            k = past.week_at(ordinal)
+            if k < 0:
+                continue
+            past.truncate(k + 1)
+            day = date.fromordinal(ordinal)
+            for h, m in metrics.compute_metrics(past, goals).items():
+                if m.recovery:
+                    status = ("recovery", None, None)
+                else:
+                    status = metrics.today_status(m, day.weekday())
+                expected.append(
+                    {
+                        "date": day.isoformat(),
+                        "week": past.ranges[k],
+                        "habit": h,
+                        "type": m.type,
+                        "goal": m.goal,
+                        "done": m.done,
+                        "status": status[0],
+                        "remaining": status[1],
+                        "streak": m.streak,
+                        "best_streak": m.best_streak,
+                        "consistency": round(m.consistency),
+                        "recovery": m.recovery,
+                        "milestone": status[2],
+                    }
+                )
+        day = date.fromordinal(first)
+        self.expect(f"{label}: --replay from {day}", expected, got)
+
+    def check_log(self, label, path, rng):
+        """`log` keeps the parse cache and patterns coherent with the file."""
+        logged = path.with_suffix(".log.md")
+        logged.write_bytes(path.read_bytes())
+        columns = store.parse_store(logged)
+        if not len(columns) or not columns.starts[-1]:
+            return
+        habits = columns.habits + ["logged"]
+        home = self.workdir / "log-home"
+        with redirect_home(home):
+            load_habits(logged)  # Warm cache, patched from here on
+            days = []
+            for _ in range(4):
+                day = columns.starts[-1] + rng.randrange(35)
+                try:
+                    log.log_entry(logged, rng.choice(habits), date.fromordinal(day))
+                except ValueError:
+                    continue  # A date in no week: file untouched
+                days.append(day)
+            fresh = store.parse_store(logged)
+            self.expect(
+                f"{label}: parse cache after log",
+                fresh.to_json(),
+                load_habits(logged).to_json(),
+            )
+            grid = columns.ends[-1] + 1
+            self.expect(
+                f"{label}: weeks after log keep the file's 7-day weeks",
+                [],
+                [s for s in fresh.starts[len(columns) :] if (s - grid) % 7],
+            )
+            weeks = list(zip(fresh.starts, fresh.ends))
+            self.expect(
+                f"{label}: logged days outside every week",
+                [],
+                [d for d in days if not any(s <= d <= e for s, e in weeks)],
+            )
+            self.expect(
+                f"{label}: patterns after log",
+                patterns.learn_patterns(fresh, save=False),
+                patterns.load_pattern_state()[0]["patterns"],
+            )
+
+    def check_index(self, label, path):
+        """index_metrics() and an incrementally synced SQLite index."""
+        goals = config.goals()
+        full = store.parse_store(path)
+        fresh = index.open_index(":memory:")
+        index.sync(fresh, full)
+
+        def numbers(ms):
+            return {h: tuple(getattr(m, f) for f in m.__slots__) for h, m in ms.items()}
+
+        self.expect(
+            f"{label}: index_metrics",
+            list(numbers(metrics.compute_metrics(full, goals)).items()),
+            list(numbers(index.index_metrics(fresh, goals)).items()),
+        )
+
+        # Cut mid-week, so the last half week must be rewritten on sync
+        data = path.read_bytes()
+        half = store.WeekStore()
+        half.parse_into(data[: len(data) // 2])
+        grown = index.open_index(":memory:")
+        index.sync(grown, half)
+        index.sync(grown, full)
+        dump = [
+            "SELECT name, pos FROM habits ORDER BY name",
+            "SELECT * FROM weeks ORDER BY idx",
+            "SELECT h.name, e.week, e.mask, e.ndays, e.total FROM entries e"
+            " JOIN habits h ON h.id = e.habit ORDER BY h.name, e.week",
+            "SELECT h.name, d.day, d.weekday, d.week FROM days d"
+            " JOIN habits h ON h.id = d.habit ORDER BY h.name, d.day, d.week",
+        ]
+        self.expect(
+            f"{label}: index synced from half the file",
+            [fresh.execute(q).fetchall() for q in dump],
+            [grown.execute(q).fetchall() for q in dump],
+        )
+
+        # From the file itself; a touch leaves the index alone
+        stamped = index.open_index(":memory:")
+        with redirect_home(self.new_home):
+            index.sync_file(stamped, path)
+            os.utime(path)
+            rewritten = index.sync_file(stamped, path)
+        self.expect(
+            f"{label}: index synced from the file, then touched",
+            ([fresh.execute(q).fetchall() for q in dump], 0),
+            ([stamped.execute(q).fetchall() for q in dump], rewritten),
+        )
+
+    def dashboard(self, main, home, argv):
+        with redirect_home(home):
+            return capture(main, ["habits-streak.py", *argv])
+
+    def expected_dashboard(self, path, text, argv):
+        day = argv[1].partition("=")[2]
+        past = path.with_suffix(".as-of.md")
+        past.write_text(text_as_of(text, day))
+        return self.dashboard(reference.main, self.ref_home, [str(past), *argv[1:]])
+
+    def check_dashboards(self, label, path, text, dates):
+        """Full dashboards from every cache path against the reference."""
+        # A truncated copy first, so the warm runs resume a grown file
+        cut = random.Random(label).randint(0, len(text))
+        path.write_text(text[:cut])
+        self.dashboard(cli.main, self.new_home, [str(path)])
+        path.write_text(text)
+
+        for i, day in enumerate(dates):
+            argv = [str(path), f"--date={day}"]
+            if i % 2:
+                argv.append("--history")
+            what = f"{label}: dashboard {' '.join(argv[1:])}"
+            expected = self.expected_dashboard(path, text, argv)
+            if i == 0:
+                got = self.dashboard(cli.main, self.new_home, argv)
+                self.expect(f"{what} (resumed cache)", expected, got)
+            got = self.dashboard(cli.main, self.new_home, argv + ["--no-cache"])
+            self.expect(f"{what} --no-cache", expected, got)
+            got = self.dashboard(cli.main, self.new_home, argv + ["--stream"])
+            self.expect(f"{what} --stream", expected, got)
+            got = self.dashboard(cli.main, self.new_home, argv)
+            self.expect(f"{what} (warm cache)", expected, got)
+
+        # Split per year, so streaks have to run across the files
+        parts = {}
+        year = "0000"
+        for line in text.splitlines(keepends=True):
+            if HEADER_LINE_RE.match(line.strip()):
+                year = line.strip()[:4]
+            parts.setdefault(year, []).append(line)
+        split_dir = path.with_suffix(".split")
+        split_dir.mkdir(exist_ok=True)
+        split = []
+        for year, lines in parts.items():
+            split.insert(0, str(split_dir / f"{year}.md"))
+            Path(split[0]).write_text("".join(lines))
+        argv = [f"--date={dates[-1]}", "--history"]
+        expected = self.expected_dashboard(path, text, [str(path), *argv])
+        got = self.dashboard(cli.main, self.new_home, split + argv)
+        self.expect(f"{label}: dashboard {argv[0]} split per year", expected, got)
+
+        # Cold cache: a fresh HOME has neither cache nor patterns state
+        argv = [str(path), f"--date={dates[0]}"]
+        expected = self.expected_dashboard(path, text, argv)
+        with tempfile.TemporaryDirectory(dir=self.workdir) as cold:
+            got = self.dashboard(cli.main, cold, argv)
+        self.expect(f"{label}: dashboard {argv[1]} (cold cache)", expected, got)
+
+
+def random_dates(rng, n, weeks):
+    """Fixed dates, then alternately inside the file's weeks and anywhere."""
+    first = SYNTH_START - timedelta(days=30)
+    spans = [weeks * 7 + 60, (date(2035, 1, 1) - first).days]
+    days = [first + timedelta(days=rng.randrange(spans[i % 2])) for i in range(n)]
+    return ORACLE_FIXED_DATES + [f"{d:%Y-%m-%d}" for d in days]
+
+
+def main(argv):
+    n_files = ORACLE_FILES
+    n_dates = ORACLE_DATES
+    max_weeks = ORACLE_MAX_WEEKS
+    seed = 0
+    for arg in argv:
+        key, _, value = arg.partition("=")
+        if key == "--files":
+            n_files = int(value)
+        elif key == "--dates":
+            n_dates = int(value)
+        elif key == "--weeks":
+            max_weeks = int(value)
+        elif key == "--seed":
+            seed = int(value)
+        else:
+            print(f"  Unknown oracle option: {arg}", file=sys.stderr)
+            return 2
+
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as workdir:
+        oracle = Oracle(workdir)
+        for i in range(n_files):
+            # Edge sizes first: empty file, a single week, then random
+            weeks = [0, 1][i] if i < 2 else rng.randint(2, max_weeks)
+            goals = synth_goals(rng.randint(1, 8))
+            text = synth_habit_text(weeks, goals, seed=rng.randrange(2**32))
+            label = f"file {i} ({weeks} weeks, {len(goals)} habits)"
+            path = Path(workdir) / f"habits-{i}.md"
+            path.write_text(text)
+
+            oracle.check_functions(label, path)
+            dates = random_dates(rng, n_dates, weeks)
+            oracle.check_dashboards(label, path, text, dates)
+            start = SYNTH_START.toordinal() - 10 + rng.randrange(weeks * 7 + 20)
+            oracle.check_replay(label, path, start)
+            oracle.check_index(label, path)
+            oracle.check_log(label, path, rng)
+            if len(oracle.failures) >= MAX_FAILURES:
+                break
+
+    for failure in oracle.failures[:MAX_FAILURES]:
+        print(f"  MISMATCH {failure}\n")
+    if oracle.failures:
+        print(f"  {len(oracle.failures)} of {oracle.checks} checks differ")
+        return 1
+    print(f"  {oracle.checks} checks on {n_files} files: identical to reference")
+    return 0
@@ -0,0 +1,85 @@
+"""
+--history on a terminal: the dashboard, then every week newest first,
+streamed into $PAGER (less -R unless set).
+
+History rows come from a generator and go down the pipe in small batches.
+A full pipe blocks the writer, so rows are only formatted as fast as the
+pager reads them: the first screen costs the same however long the history
+is, and quitting the pager stops the formatting. Column widths come from
+the habit names up front, so no row needs a second pass.
+"""
+
+import os
+import subprocess
+import sys
+from itertools import islice
+
+from .render import (
+    C,
+    fresh_start_lines,
+    history_rows,
+    render_summary,
+    text_width,
+    write_frame,
+)
+
+PAGE_BATCH = 64  # Rows per write to the pager
+MIN_CELL_WIDTH = 6
+
+
+def history_widths(habits):
+    return [max(MIN_CELL_WIDTH, text_width(h)) for h in habits]
+
+
+def paged_history(store, metrics, patterns, goals, today):
+    """Text chunks: summary, column header, weeks newest first, banner."""
+    yield render_summary(store, metrics, patterns, goals, today).text()
+
+    habits = list(metrics)
+    widths = history_widths(habits)
+    header = [f"  {C.dim}{'HISTORY':<12}{C.reset}"]
+    for h, width in zip(habits, widths):
+        header.append(f" {C.h(h)}{' ' * (width - text_width(h))}{h}{C.reset}")
+    yield "".join(header) + "\n"
+
+    rows = history_rows(store, metrics, range(len(store) - 1, -1, -1), widths)
+    while True:
+        batch = list(islice(rows, PAGE_BATCH))
+        if not batch:
+            break
+        yield "\n".join(batch) + "\n"
+
+    yield "\n".join(["", *fresh_start_lines(today)]) + "\n"
+
+
+def page(chunks, stream=None):
+    """Write text chunks to $PAGER, stopping when it exits; else to stdout."""
+    stream = stream or sys.stdout
+    env = dict(os.environ)
+    env.setdefault("LESS", "FRX")  # Raw colors, no screen clear, quit if short
+    command = os.environ.get("PAGER") or "less -R"
+    try:
+        pager = subprocess.Popen(command, shell=True, stdin=subprocess.PIPE, env=env)
+    except OSError:
+        for chunk in chunks:
+            write_frame(chunk, stream)
+        return
+
+    encoding = stream.encoding or "utf-8"
+    try:
+        for chunk in chunks:
+            pager.stdin.write(chunk.encode(encoding))
+            pager.stdin.flush()
+    except BrokenPipeError:
+        pass  # Pager quit before the end
+    finally:
+        try:
+            pager.stdin.close()
+        except BrokenPipeError:
+            pass
+        while True:
+            try:
+                pager.wait()
+                break
+            except KeyboardInterrupt:
+                pass  # Ctrl-C belongs to the pager
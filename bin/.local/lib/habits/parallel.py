@@ -0,0 +1,83 @@
+"""
+Parallel parsing of large habit files (--parallel[=WORKERS]).
+
+The file is memory-mapped and cut into chunks at week header lines; week
+blocks never span a header, so chunks parse independently. Each worker
+process maps the file itself and returns a WeekStore for its chunk, and
+the chunks are appended in file order. Files under PARALLEL_MIN_BYTES, or
+a single worker, parse serially: pool startup costs more than it saves.
+"""
+
+import mmap
+import os
+
+from .store import WeekStore
+from .tail import HEADER_LINE_RE
+
+PARALLEL_MIN_BYTES = 2 << 20
+CHUNKS_PER_WORKER = 2
+
+
+def chunk_bounds(data, n_chunks):
+    """Offsets [0, ..., len(data)] splitting `data` just before header lines."""
+    size = len(data)
+    bounds = [0]
+    for i in range(1, n_chunks):
+        target = max(bounds[-1] + 1, size * i // n_chunks)
+        # The next line start at or after target, then the next header there
+        line_start = data.rfind(b"\n", 0, target) + 1
+        match = HEADER_LINE_RE.search(data, line_start)
+        if match is None:
+            break
+        if match.start() > bounds[-1]:
+            bounds.append(match.start())
+    bounds.append(size)
+    return bounds
+
+
+def parse_chunk(filepath, start, end):
+    """(store, last header offset or -1) for bytes [start, end) of the file."""
+    with open(filepath, "rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mm:
+        chunk = mm[start:end]
+    store = WeekStore()
+    last_header = store.parse_into(chunk)
+    return store, start + last_header if last_header >= 0 else -1
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def parse_parallel(filepath, workers=None):
+    """
+    (WeekStore, last header offset) for the whole file, the same as
+    WeekStore().parse_into(data) would give.
+    """
+    workers = workers or default_workers()
+    size = os.path.getsize(filepath)
+    if workers < 2 or size < PARALLEL_MIN_BYTES:
+        with open(filepath, "rb") as f:
+            data = f.read()
+        store = WeekStore()
+        return store, store.parse_into(data)
+
+    with open(filepath, "rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mm:
+        bounds = chunk_bounds(mm, workers * CHUNKS_PER_WORKER)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = list(
+            pool.map(parse_chunk, [filepath] * (len(bounds) - 1), bounds, bounds[1:])
+        )
+
+    store, last_header = parts[0]
+    for part, part_last in parts[1:]:
+        store.extend(part)
+        if part_last >= 0:
+            last_header = part_last
+    return store, last_header
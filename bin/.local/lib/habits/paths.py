@@ -0,0 +1,39 @@
+"""Per-habit-file locations under ~/.cache/habits-streak (no heavy imports)."""
+
+import os
+import zlib
+
+
+def cache_dir():
+    return os.path.join(os.path.expanduser("~"), ".cache", "habits-streak")
+
+
+def cache_file_for(filepath, suffix):
+    """Path (str) of a per-file sidecar, keyed by the habit file's real path."""
+    real = os.path.realpath(filepath)
+    stem = os.path.splitext(os.path.basename(real))[0]
+    key = f"{stem}-{zlib.crc32(real.encode()):08x}"
+    return os.path.join(cache_dir(), key + suffix)
+
+
+def expand_paths(args):
+    """
+    Habit file arguments with ~ and globs expanded, in argument order and
+    sorted within a glob, without duplicates. A glob that matches nothing
+    is kept as written so the missing-file message can name it.
+    """
+    paths = []
+    seen = set()
+    for arg in args:
+        arg = os.path.expanduser(arg)
+        matches = [arg]
+        if any(ch in arg for ch in "*?["):
+            import glob
+
+            matches = sorted(glob.glob(arg)) or [arg]
+        for path in matches:
+            key = os.path.realpath(path)
+            if key not in seen:
+                seen.add(key)
+                paths.append(path)
+    return paths
@@ -0,0 +1,146 @@
+"""Day-of-week patterns for implementation intentions."""
+
+import json
+from collections import Counter
+from pathlib import Path
+
+from .cache import atomic_write
+from .store import DAY_NAMES
+
+# ═══════════════════════════════════════════════════════════════════════════
+# LEARNING: Track patterns for implementation intentions
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+def get_patterns_file():
+    """Get path to patterns file (stored alongside habit file)."""
+    return Path.home() / ".habit_patterns.json"
+
+
+PATTERNS_VERSION = 2
+
+
+def load_pattern_state():
+    """Returns (state or None, raw file text or None)."""
+    try:
+        text = get_patterns_file().read_text()
+        state = json.loads(text)
+    except (OSError, ValueError):
+        return None, None
+    if not isinstance(state, dict) or state.get("version") != PATTERNS_VERSION:
+        return None, text
+    return state, text
+
+
+def save_patterns(state, old_text=None):
+    """Save learned patterns atomically; skipped when nothing changed."""
+    text = json.dumps(state, indent=2)
+    if text == old_text:
+        return False
+    try:
+        atomic_write(get_patterns_file(), text)
+    except OSError:
+        return False
+    return True
+
+
+# Columns at least this long are counted with NumPy when it is installed
+NUMPY_MIN_ROWS = 4096
+
+# Weekday indices set in each 7-bit mask
+MASK_DAYS = [tuple(i for i in range(7) if m >> i & 1) for m in range(128)]
+
+_np = False
+
+
+def optional_numpy():
+    """NumPy if installed, else None. Imported on first use only."""
+    global _np
+    if _np is False:
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        _np = np
+    return _np
+
+
+def weekday_counts(masks):
+    """Weeks with each weekday set, from one habit's day-mask column."""
+    np = optional_numpy() if len(masks) >= NUMPY_MIN_ROWS else None
+    if np is not None:
+        per_mask = enumerate(
+            np.bincount(np.frombuffer(masks, dtype=np.uint8), minlength=128).tolist()
+        )
+    else:
+        per_mask = Counter(masks).items()
+
+    counts = [0] * 7
+    for mask, n in per_mask:
+        for i in MASK_DAYS[mask]:
+            counts[i] += n
+    return counts
+
+
+def learn_patterns(store, save=True):
+    """
+    Learn which days user typically completes each habit.
+    Returns: {habit: {day_name: count, ...}, ...}
+
+    This enables implementation intentions - "when X, I will Y"
+
+    The saved state remembers how many weeks it has absorbed, a digest of
+    the weeks before the last one, and that last week's day masks. While the
+    digest still matches, only the last absorbed week (which may have gained
+    days) and newer weeks are counted again. save=False (an as-of --date
+    view of the file) reads that state but leaves it alone.
+    """
+    state, old_text = load_pattern_state()
+    n = len(store)
+
+    counts = {}
+    start = 0
+    absorbed = state["absorbed"] if state else 0
+    if 0 < absorbed <= n and state["digest"] == store.digest(absorbed - 1):
+        counts = {
+            h: [days[d] for d in DAY_NAMES] for h, days in state["patterns"].items()
+        }
+        # Take the last absorbed week back out; it is counted again below
+        for h, mask in state["tail"].items():
+            for i in MASK_DAYS[mask]:
+                counts[h][i] -= 1
+        start = absorbed - 1
+
+    patterns = {}
+    for hid, habit in enumerate(store.habits):
+        habit_counts = counts.get(habit) or [0] * 7
+        new = weekday_counts(store.masks[hid][start:])
+        patterns[habit] = {
+            d: c + c_new for d, c, c_new in zip(DAY_NAMES, habit_counts, new)
+        }
+
+    if not save:
+        return patterns
+    save_patterns(
+        {
+            "version": PATTERNS_VERSION,
+            "absorbed": n,
+            "digest": store.digest(n - 1),
+            "tail": {
+                h: store.masks[hid][n - 1]
+                for hid, h in enumerate(store.habits)
+                if store.masks[hid][n - 1]
+            },
+            "patterns": patterns,
+        },
+        old_text,
+    )
+    return patterns
+
+
+def get_best_days(patterns, habit, top_n=3):
+    """Get the days user most often does this habit."""
+    if habit not in patterns:
+        return []
+    sorted_days = sorted(patterns[habit].items(), key=lambda x: -x[1])
+    return [d for d, count in sorted_days[:top_n] if count > 0]
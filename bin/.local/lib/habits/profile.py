@@ -0,0 +1,122 @@
+"""--profile: wall time and allocations per phase of a run."""
+
+import json
+import sys
+import time
+
+# Options accepted as a comma-separated list: --profile=json,time,cprofile:PATH
+PROFILE_HELP = "--profile[=json][,time][,cprofile:PATH]"
+
+
+class Profiler:
+    """
+    Runs named phases and records what each cost.
+
+    Every phase goes through run(), so adding a step to the pipeline adds it
+    to the report. Time not covered by any phase is reported as "other".
+    With tracing on (the default), tracemalloc counts the blocks and bytes
+    each phase allocated; times then include tracemalloc's own overhead, so
+    use the `time` option for clean timings.
+    """
+
+    def __init__(self, options=None, started=None):
+        self.enabled = options is not None
+        self.as_json = False
+        self.trace = self.enabled
+        self.cprofile_path = None
+        self.phases = []
+        self.started = started
+        for opt in (options or "").split(","):
+            if opt == "json":
+                self.as_json = True
+            elif opt == "time":
+                self.trace = False
+            elif opt.startswith("cprofile:"):
+                self.cprofile_path = opt.partition(":")[2]
+            elif opt:
+                raise ValueError(f"unknown --profile option {opt!r} ({PROFILE_HELP})")
+
+        self._cprofile = None
+        self._tracemalloc = None
+        self._overhead = 0.0  # Seconds spent taking tracemalloc snapshots
+        self._t0 = time.perf_counter()
+        if self.enabled and started is not None:
+            self.phases.append(("startup", (self._t0 - started) * 1000, None))
+        if self.trace:
+            import tracemalloc
+
+            self._tracemalloc = tracemalloc
+            tracemalloc.start()
+        if self.cprofile_path:
+            import cProfile
+
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def run(self, name, fn, *args, **kwargs):
+        """Call fn(*args, **kwargs) as phase `name` and return its result."""
+        if not self.enabled:
+            return fn(*args, **kwargs)
+
+        tm = self._tracemalloc
+        if tm:
+            t = time.perf_counter()
+            before = tm.take_snapshot()
+            base = tm.get_traced_memory()[0]
+            tm.reset_peak()
+            self._overhead += time.perf_counter() - t
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        end = time.perf_counter()
+        alloc = None
+        if tm:
+            peak = tm.get_traced_memory()[1]
+            diff = tm.take_snapshot().compare_to(before, "filename")
+            alloc = {
+                "blocks": sum(s.count_diff for s in diff if s.count_diff > 0),
+                "kib": sum(s.size_diff for s in diff if s.size_diff > 0) / 1024,
+                "peak_kib": (peak - base) / 1024,
+            }
+            self._overhead += time.perf_counter() - end
+        self.phases.append((name, (end - start) * 1000, alloc))
+        return result
+
+    def finish(self, stream=None):
+        """Stop collectors and write the report (stderr by default)."""
+        if not self.enabled:
+            return
+        total_ms = (time.perf_counter() - self._t0 - self._overhead) * 1000
+        measured = sum(ms for name, ms, _ in self.phases if name != "startup")
+        self.phases.append(("other", max(0.0, total_ms - measured), None))
+        if self._cprofile:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.cprofile_path)
+        if self._tracemalloc:
+            self._tracemalloc.stop()
+
+        stream = stream or sys.stderr
+        if self.as_json:
+            record = {
+                "ts": time.time(),
+                "argv": sys.argv[1:],
+                "tracemalloc": self.trace,
+                "phases": [
+                    {"phase": name, "ms": round(ms, 3), **(alloc or {})}
+                    for name, ms, alloc in self.phases
+                ],
+            }
+            stream.write(json.dumps(record) + "\n")
+            return
+
+        lines = ["  PROFILE" + ("  (times include tracemalloc)" if self.trace else "")]
+        for name, ms, alloc in self.phases:
+            line = f"  {name:<10} {ms:8.2f} ms"
+            if alloc:
+                line += (
+                    f"  {alloc['blocks']:7d} blocks  {alloc['kib']:8.1f} KiB"
+                    f"  peak {alloc['peak_kib']:8.1f} KiB"
+                )
+            lines.append(line)
+        if self.cprofile_path:
+            lines.append(f"  cProfile stats written to {self.cprofile_path}")
+        stream.write("\n".join(lines) + "\n")
@@ -0,0 +1,466 @@
+"""ANSI dashboard rendering."""
+
+import sys
+from datetime import date, datetime
+
+from .config import CONSISTENCY_WINDOW, HABIT_CONFIG
+from .metrics import need_priority, today_status
+from .patterns import get_best_days
+
+
+def get_identity_micro_prime(habits):
+    """
+    Generate single-line identity micro-prime.
+    Research: Oyserman - brief, action-oriented, pre-decisional.
+    """
+    primes = []
+    for h in habits:
+        if h in HABIT_CONFIG and "identity" in HABIT_CONFIG[h]:
+            noun, verb = HABIT_CONFIG[h]["identity"]
+            primes.append(f"{noun} {verb}")
+        else:
+            # Generic fallback
+            primes.append(f"{h}ers {h}")
+    return " · ".join(primes)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# FRESH START DETECTION (Dai, Milkman, Riis 2014)
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+def get_fresh_start_type(today=None):
+    """
+    Detect if today is a fresh start opportunity.
+    Returns: None, 'week', 'month', or 'year'
+    """
+    if today is None:
+        today = datetime.now()
+
+    if today.month == 1 and today.day <= 7:
+        return "year"
+    elif today.day <= 7:
+        return "month"
+    elif today.weekday() == 0:  # Monday
+        return "week"
+    return None
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# DISPLAY HELPERS
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+MONTHS = [
+    "Jan",
+    "Feb",
+    "Mar",
+    "Apr",
+    "May",
+    "Jun",
+    "Jul",
+    "Aug",
+    "Sep",
+    "Oct",
+    "Nov",
+    "Dec",
+]
+
+
+def format_span(m1, d1, m2, d2):
+    if m1 == m2:
+        return f"{MONTHS[m1 - 1]} {d1:2}-{d2}"
+    return f"{MONTHS[m1 - 1]} {d1}-{MONTHS[m2 - 1]} {d2}"
+
+
+def format_range(r):
+    """Format date range for display."""
+    start, end = r[:8], r[9:]
+    m1, d1 = int(start[4:6]), int(start[6:8])
+    m2, d2 = int(end[4:6]), int(end[6:8])
+    return format_span(m1, d1, m2, d2)
+
+
+def format_week(w):
+    """format_range() from a store row's date ordinals, parsed at load time."""
+    if not (w.start and w.end):
+        return format_range(w.range)  # Not a real date; show it as written
+    start, end = date.fromordinal(w.start), date.fromordinal(w.end)
+    return format_span(start.month, start.day, end.month, end.day)
+
+
+def progress_bar(filled, total, width=12):
+    """Simple progress bar."""
+    if total == 0:
+        return "░" * width
+    pct = min(1.0, filled / total)
+    full = int(pct * width)
+    return "█" * full + "░" * (width - full)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SEGMENTS: styled text with known visible width, one write per frame
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Terminal columns per non-ASCII char. Seeded with every glyph the dashboard
+# draws so normal renders never need unicodedata; others are looked up once.
+_char_widths = {ch: 1 for ch in "●○·✓★▸█░─│┌┐└┘▁▂▃▄▅▆▇→≈■"}
+_char_widths["🌱"] = 2
+
+
+def char_width(ch):
+    w = _char_widths.get(ch)
+    if w is None:
+        import unicodedata
+
+        if unicodedata.combining(ch):
+            w = 0
+        elif unicodedata.east_asian_width(ch) in ("W", "F"):
+            w = 2
+        else:
+            w = 1
+        _char_widths[ch] = w
+    return w
+
+
+def text_width(s):
+    """Visible width of plain (ANSI-free) text in terminal columns."""
+    if s.isascii():
+        return len(s)
+    return sum(map(char_width, s))
+
+
+def ljust(s, width):
+    """str.ljust by visible width (wide glyphs take two columns)."""
+    return s + " " * (width - text_width(s))
+
+
+class Line:
+    """Styled segments plus their visible width, so padding never re-scans."""
+
+    __slots__ = ("parts", "width")
+
+    def __init__(self, text="", style=""):
+        self.parts = []
+        self.width = 0
+        if text:
+            self.add(text, style)
+
+    def add(self, text, style=""):
+        if style:
+            self.parts += (style, text, C.reset)
+        else:
+            self.parts.append(text)
+        self.width += text_width(text)
+        return self
+
+    def extend(self, other):
+        self.parts += other.parts
+        self.width += other.width
+        return self
+
+    def pad(self, width):
+        """Right-pad with spaces to `width` columns."""
+        if self.width < width:
+            self.parts.append(" " * (width - self.width))
+            self.width = width
+        return self
+
+    def __str__(self):
+        return "".join(self.parts)
+
+
+class Frame:
+    """All output lines of one render, joined once at the end."""
+
+    __slots__ = ("lines",)
+
+    def __init__(self):
+        self.lines = []
+
+    def add(self, line=""):
+        self.lines.append(str(line))
+
+    def box_top(self, width):
+        self.lines.append(f"  ┌{'─' * width}┐")
+
+    def box_row(self, line, width):
+        self.lines.append(f"  │{line.pad(width)}│")
+
+    def box_blank(self, width):
+        self.lines.append(f"  │{' ' * width}│")
+
+    def box_bottom(self, width):
+        self.lines.append(f"  └{'─' * width}┘")
+
+    def text(self):
+        return "\n".join(self.lines) + "\n" if self.lines else ""
+
+
+def write_frame(text, stream=None):
+    """Write a rendered frame with a single write on the underlying stream."""
+    stream = stream or sys.stdout
+    buf = getattr(stream, "buffer", None)
+    if buf is None:
+        stream.write(text)
+        return
+    stream.flush()
+    buf.write(text.encode(stream.encoding or "utf-8"))
+    buf.flush()
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# COLORS
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+class C:
+    """ANSI color codes."""
+
+    reset = "\033[0m"
+    bold = "\033[1m"
+    dim = "\033[90m"
+    green = "\033[92m"
+    red = "\033[91m"
+    yellow = "\033[93m"
+    cyan = "\033[96m"
+
+    # Habit colors
+    habits = {h: config["color"] for h, config in HABIT_CONFIG.items()}
+
+    @classmethod
+    def h(cls, habit):
+        return cls.habits.get(habit, "\033[96m")
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# MAIN DISPLAY
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+def render_summary(store, metrics, patterns, goals, today):
+    """Everything above the history table (or the whole first-run screen)."""
+    all_habits = list(metrics)
+
+    weekday = today.weekday()
+    is_sunday = weekday == 6
+
+    # Check for habits in recovery mode
+    recovery_habits = [h for h in all_habits if metrics[h].recovery]
+    active_habits = [h for h in all_habits if not metrics[h].recovery]
+
+    # Sort active habits: struggling first (anti-licensing)
+    active_habits.sort(
+        key=lambda h: need_priority(metrics[h].done, metrics[h].goal, weekday)
+    )
+
+    out = Frame()
+    out.add()
+
+    # ═══════════════════════════════════════════════════════════════════
+    # FIRST-RUN STATE: No history yet
+    # Research: Fogg's Tiny Habits - lower the bar
+    # ═══════════════════════════════════════════════════════════════════
+    if not len(store) or not all_habits:
+        W = 50
+        out.box_top(W)
+        out.box_row(Line("  ").add("STARTING", C.bold), W)
+        out.box_blank(W)
+
+        # Show placeholder habits from goals
+        for h in goals.keys():
+            line = Line("  ").add(ljust(h, 8), C.h(h)).add(" ")
+            line.add("· · · · · · ·", C.dim).add("  first one counts")
+            out.box_row(line, W)
+
+        out.box_blank(W)
+        footer = "No history yet. That's fine. Start anywhere."
+        out.box_row(Line("  ").add(footer, C.dim), W)
+        out.box_bottom(W)
+        out.add()
+        return out
+
+    # ═══════════════════════════════════════════════════════════════════
+    # IDENTITY MICRO-PRIME (pre-action, single line)
+    # Research: Oyserman (2007) - brief, pre-decisional primes
+    # ═══════════════════════════════════════════════════════════════════
+    micro_prime = get_identity_micro_prime(all_habits)
+    out.add(f"  {C.dim}{micro_prime}{C.reset}")
+    out.add()
+
+    # ═══════════════════════════════════════════════════════════════════
+    # RECOVERY MODE (if any habits need it)
+    # Research: Self-compassion > self-criticism after failure
+    # ═══════════════════════════════════════════════════════════════════
+    if recovery_habits:
+        W = 50
+        out.box_top(W)
+        out.box_row(Line("  ").add("WELCOME BACK", C.bold), W)
+        out.box_blank(W)
+
+        for h in recovery_habits:
+            best = get_best_days(patterns, h, 2)
+            best_str = f"  (try {', '.join(best)})" if best else ""
+            out.box_row(Line("  ").add(f"○ {h}{best_str}", C.h(h)), W)
+
+        out.box_blank(W)
+        footer = "One day this week puts you back in motion."
+        out.box_row(Line("  ").add(footer, C.dim), W)
+        out.box_bottom(W)
+        out.add()
+
+    # ═══════════════════════════════════════════════════════════════════
+    # TODAY PANEL - Primary action driver
+    # Research: Immediacy drives action (Fogg)
+    # ═══════════════════════════════════════════════════════════════════
+    W = 50
+    out.box_top(W)
+
+    # Header with day name emphasized
+    day_str = today.strftime("%A")
+    date_str = today.strftime("%b %d")
+    out.box_row(Line("  ").add("TODAY", C.bold).add(f"  {day_str}, {date_str}"), W)
+    out.box_blank(W)
+
+    for h in active_habits:
+        m = metrics[h]
+        hc = C.h(h)
+        days_done = m.days_done
+
+        # Build dot display: ● done, ○ missed, · future
+        # REMOVED: yellow suggested days (felt prescriptive)
+        dots = Line()
+        for i in range(7):
+            if i < days_done:
+                dots.add("●", hc).add(" ")
+            elif i <= weekday:
+                dots.add("○", C.dim).add(" ")
+            else:
+                dots.add("·", C.dim).add(" ")
+
+        # Status with streak-to-beat; "restart?" instead of "behind" keeps
+        # the language autonomy-preserving
+        kind, remaining, milestone = today_status(m, weekday)
+        if kind == "done":
+            status = Line("✓ this week", C.green)
+        elif kind == "new_best":
+            status = Line(f"{remaining} more = new best", C.yellow)
+        elif kind == "ties_best":
+            status = Line(f"{remaining} to go · ties best")
+        elif kind == "to_go":
+            status = Line(f"{remaining} to go")
+        else:
+            status = Line("restart?")
+
+        # Milestone recognition if completed this week
+        if milestone:
+            status.add(f" · {milestone}")
+
+        content = Line("  ").add(ljust(h, 8), hc).add(" ").extend(dots).add(" ")
+        out.box_row(content.extend(status), W)
+
+    # ═══════════════════════════════════════════════════════════════════
+    # SUNDAY OBSTACLE PROMPT (WOOP completion)
+    # Research: Oettingen & Gollwitzer (2010) - obstacle identification
+    # doubles implementation intention effectiveness
+    # ═══════════════════════════════════════════════════════════════════
+    if is_sunday:
+        out.box_blank(W)
+        out.box_row(Line("  " + "─" * 46), W)
+        out.box_row(Line("  ").add("NEXT WEEK", C.bold), W)
+        out.box_row(Line("  ").add("What might get in the way?", C.dim), W)
+        out.box_row(Line("  ").add("(travel, deadline, energy)", C.dim), W)
+
+    out.box_bottom(W)
+    out.add()
+
+    # ═══════════════════════════════════════════════════════════════════
+    # CONSISTENCY (inline, compact)
+    # Shows 8-week consistency with best-streak note when relevant
+    # ═══════════════════════════════════════════════════════════════════
+    out.add(f"  {C.dim}CONSISTENCY ({CONSISTENCY_WINDOW} weeks){C.reset}")
+    out.add()
+
+    for h in all_habits:
+        hc = C.h(h)
+        m = metrics[h]
+        pct = m.consistency
+
+        bar = progress_bar(m.active, m.window, 8)
+
+        current_streak = m.streak
+        best = m.best_streak
+
+        streak_note = ""
+        if current_streak > 0 and current_streak == best and best >= 3:
+            streak_note = f" {C.yellow}★{C.reset}"
+        elif best > current_streak and best >= 4:
+            streak_note = f" {C.dim}(best: {best}w){C.reset}"
+
+        out.add(f"  {hc}▸{C.reset} {h:<10} {bar} {pct:.0f}%{streak_note}")
+
+    out.add()
+    return out
+
+
+def history_rows(store, metrics, weeks, widths=None):
+    """
+    One formatted row per week index in `weeks`, lazily. Cells are
+    `widths[hid]` wide (6 by default); the styles are built once up front.
+    """
+    habits = list(metrics)
+    widths = widths or [6] * len(habits)
+    empty_cells = [f" {C.dim}{'·':>{w}}{C.reset}" for w in widths]
+    cell_style = [
+        (f" {C.h(h)}", C.reset, metrics[h].type == "count", w)
+        for h, w in zip(habits, widths)
+    ]
+    for i in weeks:
+        w = store[i]
+        cells = [f"  {C.dim}{format_week(w):<12}{C.reset}"]
+        for hid, (prefix, suffix, is_count, width) in enumerate(cell_style):
+            days = w.days(hid)
+            if days > 0:
+                display = str(w.total(hid)) if is_count else f"{days}d"
+                cells.append(f"{prefix}{display:>{width}}{suffix}")
+            else:
+                cells.append(empty_cells[hid])
+        yield "".join(cells)
+
+
+def fresh_start_lines(today):
+    """
+    FRESH START BANNER (moved to end, subtle)
+    Research: Only relevant ~14 days/year
+    """
+    fresh_start = get_fresh_start_type(today)
+    if fresh_start == "year":
+        return [f"  {C.dim}🌱 New year. Fresh start.{C.reset}", ""]
+    if fresh_start == "month":
+        return [f"  {C.dim}🌱 {today.strftime('%B')} begins.{C.reset}", ""]
+    return []
+
+
+def render_dashboard(store, metrics, patterns, goals, today, show_full_history=False):
+    """Render the full dashboard for `today` as one string."""
+    out = render_summary(store, metrics, patterns, goals, today)
+    if not len(store) or not metrics:
+        return out.text()  # First run: no history yet
+
+    # ═══════════════════════════════════════════════════════════════════
+    # HISTORY (demoted - reference only)
+    # Default: last 4 weeks. Use --history for full view.
+    # ═══════════════════════════════════════════════════════════════════
+    if show_full_history:
+        out.add(f"  {C.dim}HISTORY{C.reset}")
+        first = 0
+    else:
+        out.add(f"  {C.dim}RECENT{C.reset}")
+        first = max(0, len(store) - 4)
+    for row in history_rows(store, metrics, range(first, len(store))):
+        out.add(row)
+    out.add()
+
+    for line in fresh_start_lines(today):
+        out.add(line)
+    return out.text()
@@ -0,0 +1,123 @@
+"""
+--replay FROM..TO: the TODAY panel for every day in a range, as NDJSON.
+
+Each record is what `--date=DAY` would have shown for one habit. Streak,
+best streak and the consistency window are advanced one week at a time as
+the days walk forward, so a replay is one pass over the weeks plus one
+status per day and habit, not a full recomputation per day.
+"""
+
+from datetime import date
+
+from .config import CONSISTENCY_WINDOW, DEFAULT_GOAL, RECOVERY_THRESHOLD
+from .metrics import HabitMetrics, today_status
+
+
+def parse_replay_range(spec, store):
+    """
+    (first, last) date ordinals for "FROM..TO" (YYYY-MM-DD). An empty end
+    means the first week's start / the last week's end.
+    """
+    first, sep, last = spec.partition("..")
+    if not sep:
+        raise ValueError(f"--replay wants FROM..TO, got {spec!r}")
+    try:
+        first = date.fromisoformat(first).toordinal() if first else None
+        last = date.fromisoformat(last).toordinal() if last else None
+    except ValueError as e:
+        raise ValueError(f"--replay: {e}") from None
+    if first is None:
+        first = min((s for s in store.starts if s), default=1)
+    if last is None:
+        last = max((e for e in store.ends if e), default=0)
+    return first, last
+
+
+class ReplayState:
+    """Per-habit metrics as of week `n - 1`, advanced one week at a time."""
+
+    def __init__(self, store, goals, window=CONSISTENCY_WINDOW):
+        self.store = store
+        self.goals = goals
+        self.window = window
+        self.activity = [store.activity(hid) for hid in range(len(store.habits))]
+        self.reset()
+
+    def reset(self):
+        self.n = 0
+        self.metrics = []
+        for h in self.store.habits:
+            m = HabitMetrics()
+            m.streak = m.best_streak = m.active = m.window = 0
+            m.recovery = False
+            m.days_done = m.total = 0
+            goal_info = self.goals.get(h, DEFAULT_GOAL)
+            m.goal = goal_info["goal"]
+            m.type = goal_info["type"]
+            self.metrics.append(m)
+
+    def advance(self):
+        """Take week n into account (same numbers as compute_metrics)."""
+        store, i, window = self.store, self.n, self.window
+        self.n += 1
+        for hid, m in enumerate(self.metrics):
+            vec = self.activity[hid]
+            if vec[i]:
+                m.streak += 1
+                m.best_streak = max(m.best_streak, m.streak)
+                m.active += 1
+            else:
+                m.streak = 0
+            if window <= 0:
+                pass
+            elif m.window < window:
+                m.window += 1
+            else:
+                m.active -= vec[i - window]
+            m.recovery = self.n >= RECOVERY_THRESHOLD and not any(
+                vec[self.n - RECOVERY_THRESHOLD : self.n]
+            )
+            m.days_done = store.ndays[hid][i]
+            m.total = store.totals[hid][i]
+
+    def seek(self, k):
+        """Metrics as of week k; going backwards (unordered file) restarts."""
+        if k + 1 < self.n:
+            self.reset()
+        while self.n <= k:
+            self.advance()
+
+
+def replay(store, goals, first, last):
+    """Yield one record per day in [first, last] per habit known by then."""
+    state = ReplayState(store, goals)
+    for ordinal in range(first, last + 1):
+        k = store.week_at(ordinal)
+        if k < 0:
+            continue  # Before the first week: the STARTING screen
+        state.seek(k)
+        day = date.fromordinal(ordinal)
+        weekday = day.weekday()
+        day_str = day.isoformat()
+        for hid, m in enumerate(state.metrics):
+            if store.first_week[hid] > k:
+                continue  # Not seen yet as of this day
+            if m.recovery:
+                kind, remaining, milestone = "recovery", None, None
+            else:
+                kind, remaining, milestone = today_status(m, weekday)
+            yield {
+                "date": day_str,
+                "week": store.ranges[k],
+                "habit": store.habits[hid],
+                "type": m.type,
+                "goal": m.goal,
+                "done": m.done,
+                "status": kind,
+                "remaining": remaining,
+                "streak": m.streak,
+                "best_streak": m.best_streak,
+                "consistency": round(m.consistency),
+                "recovery": m.recovery,
+                "milestone": milestone,
+            }
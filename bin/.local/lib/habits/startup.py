@@ -0,0 +1,60 @@
+"""Cold-start budget check built on `python -X importtime`."""
+
+import os
+import subprocess
+import sys
+import time
+
+# Budget for everything a run imports (interpreter site modules included)
+STARTUP_BUDGET_MS = 50.0
+
+# Runs per check; the fastest is kept so a bytecode rewrite doesn't count
+STARTUP_RUNS = 3
+
+
+def parse_importtime(stderr):
+    """[(module, self_us, cumulative_us, depth)] from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # Column header or unrelated stderr
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), int(parts[0]), int(parts[1]), depth))
+    return rows
+
+
+def check_startup(args, budget_ms=None, runs=STARTUP_RUNS):
+    """
+    Run this command with `args` under -X importtime and compare the total
+    import time with the budget. Returns an exit status (1 = over budget).
+    """
+    if budget_ms is None:
+        budget_ms = STARTUP_BUDGET_MS
+    cmd = [sys.executable, "-X", "importtime", os.path.realpath(sys.argv[0]), *args]
+
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+        )
+        wall_ms = (time.perf_counter() - start) * 1000
+        rows = parse_importtime(proc.stderr)
+        total_ms = sum(cum for _, _, cum, depth in rows if depth == 0) / 1000
+        if best is None or total_ms < best[0]:
+            best = (total_ms, wall_ms, rows)
+
+    total_ms, wall_ms, rows = best
+    print(f"  slowest imports ({' '.join(args) or 'no args'}):")
+    for name, self_us, _, _ in sorted(rows, key=lambda r: -r[1])[:8]:
+        print(f"    {self_us / 1000:6.2f} ms  {name}")
+    verdict = "over budget" if total_ms > budget_ms else "ok"
+    print(
+        f"  imports {total_ms:.1f} ms · wall {wall_ms:.1f} ms"
+        f" · budget {budget_ms:.0f} ms · {verdict}"
+    )
+    return 1 if total_ms > budget_ms else 0
@@ -0,0 +1,388 @@
+"""Habit file parsing into a column store of weekly data."""
+
+import re
+import zlib
+from array import array
+from bisect import bisect_right
+from datetime import date
+
+# ═══════════════════════════════════════════════════════════════════════════
+# DATA PARSING
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+HEADER_RE = re.compile(rb"^\d{8}-\d{8}$")
+ENTRY_RE = re.compile(r"(\w+)\s+(\d+)")
+
+DAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+FULL_DAY_NAMES = [
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+]
+
+# Every accepted spelling -> weekday index: all prefixes of the full names from
+# two letters up ("mo", "mon", "mond", ..., "th", "thu", "thurs", ...), plus the
+# single-letter forms. "T" means Tuesday; "S" is ambiguous and stays unknown.
+DAY_TABLE = {
+    name[:n]: idx
+    for idx, name in enumerate(FULL_DAY_NAMES)
+    for n in range(2, len(name) + 1)
+}
+DAY_TABLE.update({"m": 0, "t": 1, "w": 2, "f": 4})
+
+# Returned for tokens that name no weekday ("?" for undated counts, typos)
+UNKNOWN_DAY = None
+
+# Raw token -> index, filled on first sight so repeated tokens cost one lookup
+_day_cache = {}
+
+
+def day_index(day):
+    """
+    Normalize a logged day token to a weekday index (Mon=0).
+    Tokens that only start with a known spelling ("Mondays", "Weds") use the
+    longest matching prefix; anything else is UNKNOWN_DAY.
+    """
+    try:
+        return _day_cache[day]
+    except KeyError:
+        pass
+    t = day.lower()
+    idx = UNKNOWN_DAY
+    for key in (t, t[:3], t[:2], t[:1]):
+        if key in DAY_TABLE:
+            idx = DAY_TABLE[key]
+            break
+    _day_cache[day] = idx
+    return idx
+
+
+def scan_habit_bytes(data, start=0):
+    """
+    Tokenize raw habit file bytes from `start`.
+    Yields (offset, range, None) for week headers and
+    (offset, name, (days, total)) for habit lines.
+    """
+    return scan_habit_lines(data[start:].split(b"\n"), start)
+
+
+def scan_habit_lines(lines, start=0):
+    """scan_habit_bytes() over byte lines without their newlines."""
+    pos = start
+    for raw in lines:
+        line_start = pos
+        pos += len(raw) + 1
+        raw = raw.strip()
+        if not raw or raw.startswith(b"#"):
+            continue
+
+        if HEADER_RE.match(raw):
+            yield line_start, raw.decode(), None
+        elif b":" in raw:
+            name, value = raw.decode().split(":", 1)
+            name = name.strip()
+            value = value.strip()
+
+            days = []
+            total = 0
+            if value != "0":
+                for part in value.split(","):
+                    part = part.strip()
+                    match = ENTRY_RE.match(part)
+                    if match:
+                        days.append(match.group(1))
+                        total += int(match.group(2))
+                if not days and value.isdigit() and int(value) > 0:
+                    total = int(value)
+                    days = ["?"]
+
+            yield line_start, name, (days, total)
+
+
+def iter_weeks(filepath):
+    """
+    Stream (range, {habit: (days, total)}) per week from a habit file, with
+    one week in memory at a time. Later lines for the same habit win.
+    """
+    week = None
+    with open(filepath, "rb") as f:
+        for _, key, entry in scan_habit_lines(line.rstrip(b"\n") for line in f):
+            if entry is None:
+                if week is not None:
+                    yield week
+                week = (key, {})
+            elif week is not None:
+                week[1][key] = entry
+    if week is not None:
+        yield week
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# WEEK STORE: interned habits, one array column per habit
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+def range_start_ordinal(r):
+    """Ordinal of the first date in a YYYYMMDD-YYYYMMDD range (0 if invalid)."""
+    try:
+        return date(int(r[:4]), int(r[4:6]), int(r[6:8])).toordinal()
+    except ValueError:
+        return 0
+
+
+def range_end_ordinal(r):
+    """Ordinal of the last date in a YYYYMMDD-YYYYMMDD range (0 if invalid)."""
+    return range_start_ordinal(r[9:])
+
+
+def is_ordered(starts):
+    return all(a <= b for a, b in zip(starts, starts[1:]))
+
+
+class Week:
+    """One row of a WeekStore."""
+
+    __slots__ = ("store", "index")
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    @property
+    def range(self):
+        return self.store.ranges[self.index]
+
+    @property
+    def start(self):
+        return self.store.starts[self.index]
+
+    @property
+    def end(self):
+        return self.store.ends[self.index]
+
+    def mask(self, hid):
+        """7-bit day mask (bit 0 = Monday)."""
+        return self.store.masks[hid][self.index]
+
+    def days(self, hid):
+        """Number of logged day entries (includes undated "?" entries)."""
+        return self.store.ndays[hid][self.index]
+
+    def total(self, hid):
+        return self.store.totals[hid][self.index]
+
+
+class WeekStore:
+    """
+    Weekly habit data as columns.
+
+    habits[hid] is the habit name (first-seen order), and for each habit id
+    masks[hid] / ndays[hid] / totals[hid] hold one value per week. A habit
+    missing from a week is stored as zeros, which every metric already
+    treats the same as an explicit "habit: 0".
+
+    starts / ends are the week ranges as date ordinals, parsed once. While
+    the starts never decrease (`ordered`), week_at() is a binary search.
+    """
+
+    __slots__ = (
+        "habits",
+        "habit_ids",
+        "first_week",
+        "ranges",
+        "starts",
+        "ends",
+        "ordered",
+        "masks",
+        "ndays",
+        "totals",
+    )
+
+    def __init__(self):
+        self.habits = []
+        self.habit_ids = {}
+        self.first_week = array("l")
+        self.ranges = []
+        self.starts = array("l")
+        self.ends = array("l")
+        self.ordered = True
+        self.masks = []
+        self.ndays = []
+        self.totals = []
+
+    def __len__(self):
+        return len(self.ranges)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self.ranges)
+        if not 0 <= i < len(self.ranges):
+            raise IndexError(i)
+        return Week(self, i)
+
+    def __iter__(self):
+        return (Week(self, i) for i in range(len(self.ranges)))
+
+    def intern(self, name):
+        hid = self.habit_ids.get(name)
+        if hid is None:
+            hid = self.habit_ids[name] = len(self.habits)
+            n = len(self.ranges)
+            self.habits.append(name)
+            self.first_week.append(n - 1)
+            self.masks.append(bytearray(n))
+            self.ndays.append(array("H", bytes(2 * n)))
+            self.totals.append(array("q", bytes(8 * n)))
+        return hid
+
+    def add_week(self, r):
+        start = range_start_ordinal(r)
+        if self.starts and start < self.starts[-1]:
+            self.ordered = False
+        self.ranges.append(r)
+        self.starts.append(start)
+        self.ends.append(range_end_ordinal(r))
+        for col in self.masks:
+            col.append(0)
+        for col in self.ndays:
+            col.append(0)
+        for col in self.totals:
+            col.append(0)
+
+    def set_entry(self, name, days, total):
+        """Set a habit's entry in the latest week (later lines win)."""
+        mask = 0
+        for day in days:
+            idx = day_index(day)
+            if idx is not UNKNOWN_DAY:
+                mask |= 1 << idx
+        self.set_values(name, mask, min(len(days), 0xFFFF), total)
+
+    def set_values(self, name, mask, ndays, total):
+        """set_entry() from an already computed day mask and day count."""
+        hid = self.intern(name)
+        self.masks[hid][-1] = mask
+        self.ndays[hid][-1] = ndays
+        self.totals[hid][-1] = total
+
+    def truncate(self, n):
+        """Drop weeks from index n onwards, and habits first seen in them."""
+        while self.habits and self.first_week[-1] >= n:
+            del self.habit_ids[self.habits.pop()]
+            self.first_week.pop()
+            self.masks.pop()
+            self.ndays.pop()
+            self.totals.pop()
+        del self.ranges[n:]
+        del self.starts[n:]
+        del self.ends[n:]
+        if not self.ordered:
+            self.ordered = is_ordered(self.starts)
+        for cols in (self.masks, self.ndays, self.totals):
+            for col in cols:
+                del col[n:]
+
+    def extend(self, other):
+        """Append the weeks of `other`, parsed from a later part of the file."""
+        base = len(self.ranges)
+        n = len(other.ranges)
+        if other.starts and self.starts and other.starts[0] < self.starts[-1]:
+            self.ordered = False
+        self.ordered = self.ordered and other.ordered
+        self.ranges += other.ranges
+        self.starts += other.starts
+        self.ends += other.ends
+        for col in self.masks:
+            col += bytes(n)
+        for col in self.ndays:
+            col += array("H", bytes(2 * n))
+        for col in self.totals:
+            col += array("q", bytes(8 * n))
+        for hid, h in enumerate(other.habits):
+            mine = self.habit_ids.get(h)
+            if mine is None:
+                mine = self.intern(h)
+                self.first_week[mine] = base + other.first_week[hid]
+            self.masks[mine][base:] = other.masks[hid]
+            self.ndays[mine][base:] = other.ndays[hid]
+            self.totals[mine][base:] = other.totals[hid]
+
+    def digest(self, n):
+        """CRC of the ranges and day masks of the first n weeks."""
+        crc = zlib.crc32("\n".join(self.ranges[:n]).encode())
+        for hid, h in enumerate(self.habits):
+            if self.first_week[hid] < n:
+                crc = zlib.crc32(h.encode(), crc)
+                crc = zlib.crc32(self.masks[hid][:n], crc)
+        return crc
+
+    def week_at(self, ordinal):
+        """
+        Index of the week a date falls in: the latest-starting week that
+        starts on or before it (so a date in a gap, or after the last week,
+        gets the week before). -1 if every week starts after it.
+        """
+        if self.ordered:
+            return bisect_right(self.starts, ordinal) - 1
+        # Out-of-order headers: linear scan, later lines win ties
+        best = -1
+        for i, start in enumerate(self.starts):
+            if start <= ordinal and (best < 0 or start >= self.starts[best]):
+                best = i
+        return best
+
+    def activity(self, hid):
+        """bytes with 1 for each week the habit had any logged day."""
+        return bytes(map(bool, self.ndays[hid]))
+
+    def parse_into(self, data, start=0):
+        """Append weeks parsed from `data[start:]`; returns last header offset."""
+        last_header = -1
+        for offset, key, entry in scan_habit_bytes(data, start):
+            if entry is None:
+                self.add_week(key)
+                last_header = offset
+            elif last_header >= 0:
+                self.set_entry(key, *entry)
+        return last_header
+
+    def to_json(self):
+        return {
+            "habits": self.habits,
+            "first_week": self.first_week.tobytes().hex(),
+            "ranges": self.ranges,
+            "starts": self.starts.tobytes().hex(),
+            "ends": self.ends.tobytes().hex(),
+            "masks": [col.hex() for col in self.masks],
+            "ndays": [col.tobytes().hex() for col in self.ndays],
+            "totals": [col.tobytes().hex() for col in self.totals],
+        }
+
+    @classmethod
+    def from_json(cls, obj):
+        store = cls()
+        store.habits = obj["habits"]
+        store.habit_ids = {h: i for i, h in enumerate(store.habits)}
+        store.first_week = array("l", bytes.fromhex(obj["first_week"]))
+        store.ranges = obj["ranges"]
+        store.starts = array("l", bytes.fromhex(obj["starts"]))
+        store.ends = array("l", bytes.fromhex(obj["ends"]))
+        store.ordered = is_ordered(store.starts)
+        store.masks = [bytearray.fromhex(col) for col in obj["masks"]]
+        store.ndays = [array("H", bytes.fromhex(col)) for col in obj["ndays"]]
+        store.totals = [array("q", bytes.fromhex(col)) for col in obj["totals"]]
+        return store
+
+
+def parse_store(filepath):
+    """Parse habit file into a WeekStore."""
+    with open(filepath, "rb") as f:
+        data = f.read()
+    store = WeekStore()
+    store.parse_into(data)
+    return store
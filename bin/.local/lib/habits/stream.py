@@ -0,0 +1,109 @@
+"""
+--stream: dashboard inputs from one pass over the file in bounded memory.
+
+Weeks come from the iter_weeks() generator and are folded into per-habit
+running state, so memory grows with the number of habits, not weeks:
+  - current and best streak as counters,
+  - the last max(CONSISTENCY_WINDOW, RECOVERY_THRESHOLD) weeks of activity
+    as a bit ring (one int per habit),
+  - weekday counts for the patterns,
+  - the last 4 weeks of entries for the history table (all weeks with
+    --history, which needs them).
+The result is the same metrics and patterns the WeekStore path computes.
+"""
+
+from collections import deque
+
+from .config import CONSISTENCY_WINDOW, DEFAULT_GOAL, RECOVERY_THRESHOLD
+from .metrics import HabitMetrics
+from .store import (
+    DAY_NAMES,
+    UNKNOWN_DAY,
+    WeekStore,
+    day_index,
+    iter_weeks,
+    range_start_ordinal,
+)
+
+RECENT_WEEKS = 4
+
+
+class StreamState:
+    """Running metrics, fed one week at a time by add_week()."""
+
+    def __init__(self, goals, window=CONSISTENCY_WINDOW, threshold=RECOVERY_THRESHOLD):
+        self.goals = goals
+        self.window = window
+        self.threshold = threshold
+        self.ring_mask = (1 << max(window, threshold, 1)) - 1
+        self.n = 0
+        self.metrics = {}  # First-seen order
+        self.recent = {}  # habit -> activity bits, bit 0 = latest week
+        self.weekdays = {}  # habit -> [count per weekday]
+
+    def add_week(self, entries):
+        self.n += 1
+        for h, (days, _) in entries.items():
+            if h not in self.metrics:
+                m = HabitMetrics()
+                m.streak = m.best_streak = 0
+                goal_info = self.goals.get(h, DEFAULT_GOAL)
+                m.goal = goal_info["goal"]
+                m.type = goal_info["type"]
+                self.metrics[h] = m
+                self.recent[h] = 0
+                self.weekdays[h] = [0] * 7
+
+        for h, m in self.metrics.items():
+            days, total = entries.get(h, ((), 0))
+            active = bool(days)
+            self.recent[h] = ((self.recent[h] << 1) | active) & self.ring_mask
+            m.streak = m.streak + 1 if active else 0
+            m.best_streak = max(m.best_streak, m.streak)
+            m.days_done = min(len(days), 0xFFFF)
+            m.total = total
+            # Distinct known weekdays, as the day-mask column would hold them
+            counts = self.weekdays[h]
+            for i in {day_index(d) for d in days} - {UNKNOWN_DAY}:
+                counts[i] += 1
+
+    def finish(self):
+        """{habit: HabitMetrics} and patterns, as of the last week added."""
+        window = min(self.window, self.n) if self.window > 0 else 0
+        for h, m in self.metrics.items():
+            bits = self.recent[h]
+            m.active = bin(bits & ((1 << window) - 1)).count("1")
+            m.window = window
+            m.recovery = self.n >= self.threshold and not (
+                bits & ((1 << self.threshold) - 1)
+            )
+        patterns = {
+            h: dict(zip(DAY_NAMES, counts)) for h, counts in self.weekdays.items()
+        }
+        return self.metrics, patterns
+
+
+def stream_dashboard(filepath, goals, until=None, keep_all=False):
+    """
+    (store, metrics, patterns) for render_dashboard(). The store only holds
+    the weeks the history table shows. `until` (a date ordinal) stops at
+    the first week starting after it, like --date on an ordered file.
+    """
+    state = StreamState(goals)
+    kept = [] if keep_all else deque(maxlen=RECENT_WEEKS)
+    for r, entries in iter_weeks(filepath):
+        if until is not None and range_start_ordinal(r) > until:
+            break
+        state.add_week(entries)
+        kept.append((r, entries))
+    metrics, patterns = state.finish()
+
+    # Intern in first-seen order so store ids line up with `metrics`
+    store = WeekStore()
+    for h in metrics:
+        store.intern(h)
+    for r, entries in kept:
+        store.add_week(r)
+        for h, (days, total) in entries.items():
+            store.set_entry(h, days, total)
+    return store, metrics, patterns
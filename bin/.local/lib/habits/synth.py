@@ -0,0 +1,100 @@
+"""Synthetic habit files (and a scratch HOME) for benchmarks and differential checks."""
+
+import os
+import random
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from .config import HABIT_CONFIG
+
+# Day spellings seen in real logs; canonical ones weighted heaviest
+DAY_SPELLINGS = [
+    ["Mon"] * 6 + ["M", "Mo", "monday"],
+    ["Tue"] * 6 + ["T", "Tu", "tues"],
+    ["Wed"] * 6 + ["W", "We", "weds"],
+    ["Thu"] * 6 + ["Th", "thurs", "Thursday"],
+    ["Fri"] * 6 + ["F", "Fr", "friday"],
+    ["Sat"] * 6 + ["Sa", "saturday"],
+    ["Sun"] * 6 + ["Su", "sunday"],
+]
+
+SYNTH_START = date(2015, 1, 5)  # A Monday
+
+
+def synth_goals(n_habits):
+    """
+    Goals for n habits: the configured ones first, then extras alternating
+    between "days" and "count" goals like HABIT_CONFIG.
+    """
+    goals = {h: c["goal"] for h, c in list(HABIT_CONFIG.items())[:n_habits]}
+    i = 0
+    while len(goals) < n_habits:
+        if i % 3 == 2:
+            goals[f"habit{i}"] = {"goal": 6 + i % 7, "type": "count"}
+        else:
+            goals[f"habit{i}"] = {"goal": 2 + i % 5, "type": "days"}
+        i += 1
+    return goals
+
+
+def synth_habit_text(weeks, goals, seed=0, start=SYNTH_START):
+    """
+    A habit file of `weeks` weekly blocks for the habits in `goals`.
+
+    Each habit has its own reliability, lapses of 2-6 weeks (so recovery mode
+    triggers), "habit: 0" lines, bare counts that parse as "?" entries,
+    alternate day spellings, duplicate days, comments and blank lines.
+    """
+    rng = random.Random(seed)
+    reliability = {h: rng.uniform(0.55, 0.95) for h in goals}
+    lapse = dict.fromkeys(goals, 0)
+
+    lines = ["# Habit tracking", ""]
+    for w in range(weeks):
+        first = start + timedelta(weeks=w)
+        last = first + timedelta(days=6)
+        lines.append(f"{first:%Y%m%d}-{last:%Y%m%d}")
+        for h, goal in goals.items():
+            if lapse[h]:
+                lapse[h] -= 1
+                if rng.random() < 0.5:
+                    lines.append(f"{h}: 0")
+                continue
+            if rng.random() < 0.04:
+                lapse[h] = rng.randint(1, 5)
+            if rng.random() > reliability[h]:
+                if rng.random() < 0.3:
+                    lines.append(f"{h}: 0")
+                continue
+
+            n_days = max(1, min(7, round(rng.gauss(goal["goal"] * 0.8, 1.5))))
+            days = sorted(rng.sample(range(7), n_days))
+            if rng.random() < 0.03:
+                days.append(days[0])  # Same day logged twice
+            if goal["type"] == "count" and rng.random() < 0.15:
+                lines.append(f"{h}: {rng.randint(1, goal['goal'] * 2)}")
+                continue
+            top = 4 if goal["type"] == "count" else 1
+            entries = [
+                f"{rng.choice(DAY_SPELLINGS[d])} {rng.randint(1, top)}" for d in days
+            ]
+            lines.append(f"{h}: " + ", ".join(entries))
+        if rng.random() < 0.05:
+            lines.append("")
+        if rng.random() < 0.02:
+            lines.append("# note: travel week")
+    return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def redirect_home(path):
+    """Point HOME (so cache, patterns and socket files) at `path` for a block."""
+    old = os.environ.get("HOME")
+    os.environ["HOME"] = str(path)
+    try:
+        yield
+    finally:
+        if old is None:
+            del os.environ["HOME"]
+        else:
+            os.environ["HOME"] = old
@@ -0,0 +1,98 @@
+"""Status-line fast path: reads only the end of the habit file."""
+
+import os
+import re
+
+from .config import DEFAULT_GOAL
+from .store import scan_habit_bytes
+
+# ═══════════════════════════════════════════════════════════════════════════
+# TAIL FAST PATH: current week + streak without reading the whole file
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Header line (whitespace-tolerant, like the line scanner) inside a block
+HEADER_LINE_RE = re.compile(rb"^[ \t\r\x0b\x0c]*\d{8}-\d{8}[ \t\r\x0b\x0c]*$", re.M)
+
+TAIL_BLOCK_SIZE = 8192
+
+
+def week_blocks_reversed(f, block_size=TAIL_BLOCK_SIZE):
+    """
+    Yield (offset, bytes) of each week block of an open binary file, from
+    the last one backwards, reading from EOF in blocks. A block runs from
+    its header line to the next header (or EOF).
+    """
+    pos = f.seek(0, os.SEEK_END)
+    buf = b""
+    while True:
+        last = None
+        for last in HEADER_LINE_RE.finditer(buf):
+            pass
+        # A match at buf[0] may be the cut-off end of a longer line
+        if last is not None and (last.start() > 0 or pos == 0):
+            yield pos + last.start(), buf[last.start() :]
+            buf = buf[: last.start()]
+        elif pos == 0:
+            return  # Only lines before the first header are left
+        else:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+
+
+def iter_weeks_reversed(filepath, block_size=TAIL_BLOCK_SIZE):
+    """
+    Yield (range, {habit: (days, total)}) from the last week backwards.
+    Stops reading once the caller does.
+    """
+    with open(filepath, "rb") as f:
+        for _, block in week_blocks_reversed(f, block_size):
+            habits = {}
+            rng = None
+            for _, key, entry in scan_habit_bytes(block):
+                if entry is None:
+                    rng = key
+                else:
+                    habits[key] = entry
+            yield rng, habits
+
+
+def tail_status(filepath, goals):
+    """
+    This week's progress and current streak per habit.
+    Returns [(habit, done, goal, type, streak)]: habits of the current week
+    in file order, then configured habits missing from it. Reading stops at
+    the first week where every habit's streak is broken.
+    """
+    rows = []
+    streaks = {}
+    open_streaks = set()
+    for i, (_, habits) in enumerate(iter_weeks_reversed(filepath)):
+        if i == 0:
+            tracked = list(habits) + [h for h in goals if h not in habits]
+            streaks = dict.fromkeys(tracked, 0)
+            open_streaks = set(tracked)
+            for h in tracked:
+                goal_info = goals.get(h, DEFAULT_GOAL)
+                days, total = habits.get(h, ((), 0))
+                done = total if goal_info["type"] == "count" else len(days)
+                rows.append([h, done, goal_info["goal"], goal_info["type"]])
+        for h in list(open_streaks):
+            entry = habits.get(h)
+            if entry and entry[0]:
+                streaks[h] += 1
+            else:
+                open_streaks.discard(h)
+        if not open_streaks:
+            break
+    return [(*row, streaks[row[0]]) for row in rows]
+
+
+def format_status(rows):
+    """Compact single-line status, e.g. `saas 3/4 5w · study ✓ 2w · tweets 7/10`."""
+    parts = []
+    for h, done, goal, _, streak in rows:
+        progress = "✓" if done >= goal else f"{done}/{goal}"
+        parts.append(f"{h} {progress}" + (f" {streak}w" if streak else ""))
+    return " · ".join(parts)
@@ -0,0 +1,129 @@
+"""Prefix-sum rolling statistics and the --trend sparkline view."""
+
+from array import array
+from datetime import date
+from itertools import accumulate
+
+from .patterns import NUMPY_MIN_ROWS, optional_numpy
+from .render import C, Frame, Line
+
+TREND_WINDOWS = [4, 8, 12, 52]
+SPARKS = "▁▂▃▄▅▆▇█"
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PREFIX SUMS: any window's active weeks / total in O(1)
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+class PrefixSums:
+    """
+    Per habit, cumulative active weeks and totals with a leading 0, so the
+    weeks [start, end) sum to P[end] - P[start]. Built once per store with
+    NumPy's cumsum on long histories, itertools.accumulate otherwise.
+    """
+
+    __slots__ = ("n", "np", "active", "totals")
+
+    def __init__(self, store):
+        self.n = len(store)
+        self.np = np = optional_numpy() if self.n >= NUMPY_MIN_ROWS else None
+        self.active = []
+        self.totals = []
+        for hid in range(len(store.habits)):
+            activity = store.activity(hid)
+            if np is not None:
+                active = np.zeros(self.n + 1, dtype=np.int64)
+                totals = np.zeros(self.n + 1, dtype=np.int64)
+                np.cumsum(np.frombuffer(activity, dtype=np.uint8), out=active[1:])
+                np.cumsum(np.asarray(store.totals[hid]), out=totals[1:])
+            else:
+                active = array("q", accumulate(activity, initial=0))
+                totals = array("q", accumulate(store.totals[hid], initial=0))
+            self.active.append(active)
+            self.totals.append(totals)
+
+    def active_weeks(self, hid, end, window):
+        """Active weeks among the `window` weeks before week index `end`."""
+        p = self.active[hid]
+        return int(p[end] - p[max(0, end - window)])
+
+    def total(self, hid, end, window):
+        p = self.totals[hid]
+        return int(p[end] - p[max(0, end - window)])
+
+    def consistency(self, hid, end, window):
+        """get_consistency() as a percentage, as of week index end - 1."""
+        weeks = min(window, end)
+        return self.active_weeks(hid, end, window) / weeks * 100 if weeks else 0
+
+    def rolling(self, hid, ends, window):
+        """consistency() at each of `ends`."""
+        p = self.active[hid]
+        np = self.np
+        if np is not None:
+            ends = np.asarray(ends, dtype=np.int64)
+            starts = np.maximum(ends - window, 0)
+            weeks = np.maximum(ends - starts, 1)
+            return ((p[ends] - p[starts]) / weeks * 100).tolist()
+        return [self.consistency(hid, end, window) for end in ends]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# TREND VIEW
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+def sparkline(values, low=0.0, high=100.0):
+    """One block character per value; None is a blank."""
+    top = len(SPARKS) - 1
+    span = (high - low) or 1.0
+    chars = []
+    for v in values:
+        if v is None:
+            chars.append(" ")
+        else:
+            chars.append(SPARKS[round((min(max(v, low), high) - low) / span * top)])
+    return "".join(chars)
+
+
+def render_trend(store, width=80, windows=TREND_WINDOWS):
+    """
+    Rolling consistency per habit across the whole history, one sparkline
+    per window. Long histories are sampled down to the available columns;
+    each sample is an O(1) prefix-sum lookup.
+    """
+    out = Frame()
+    out.add()
+    n = len(store)
+    if not n:
+        out.add(f"  {C.dim}No history yet.{C.reset}")
+        out.add()
+        return out.text()
+
+    # "  52w " + sparkline + "  100%"
+    columns = max(1, min(n, width - 14))
+    ends = [-(-(j + 1) * n // columns) for j in range(columns)]  # ceil
+    sums = PrefixSums(store)
+
+    first, last = store.starts[0], store.ends[-1]
+    span = ""
+    if first and last:
+        span = f"{date.fromordinal(first)} → {date.fromordinal(last)}, "
+    per_col = f"1 col ≈ {n / columns:.1f} weeks" if columns < n else "1 col = 1 week"
+    caption = f"rolling consistency, {span}{per_col}"
+    out.add(f"  {C.bold}TREND{C.reset}{C.dim}  {caption}{C.reset}")
+    out.add()
+
+    for hid, h in enumerate(store.habits):
+        hc = C.h(h)
+        out.add(f"  {hc}▸{C.reset} {h}")
+        seen = store.first_week[hid]
+        for window in windows:
+            values = sums.rolling(hid, ends, window)
+            values = [v if end > seen else None for v, end in zip(values, ends)]
+            now = sums.consistency(hid, n, window)
+            line = Line("  ").add(f"{window:>3}w ", C.dim).add(sparkline(values), hc)
+            out.add(line.add(f" {now:>4.0f}%"))
+        out.add()
+    return out.text()
@@ -0,0 +1,185 @@
+"""
+--watch: keep the dashboard on screen and repaint it when the file changes.
+
+The file is watched the way --serve watches it (inotify, else stat
+polling). A change re-parses from the last week header when only the tail
+changed, and recomputes metrics only for the habits whose numbers moved.
+The new frame is diffed line by line against the one on screen and only
+changed lines are rewritten, by cursor address. The loop also wakes at
+midnight, so the TODAY panel moves on to the new day without a file change.
+"""
+
+import os
+import select
+import signal
+import sys
+from datetime import datetime, timedelta
+from shutil import get_terminal_size
+
+from .cache import can_resume, resume_point
+from .daemon import POLL_INTERVAL, FileWatcher
+from .metrics import compute_metrics
+from .patterns import learn_patterns
+from .render import render_dashboard, write_frame
+from .store import WeekStore
+
+# Longest sleep without a file change; select() timeouts do not count time
+# spent suspended, so this bounds how late the midnight repaint can be
+MAX_SLEEP = 60.0
+
+ENTER_SCREEN = "\033[?1049h\033[?25l"  # Alternate screen, cursor hidden
+LEAVE_SCREEN = "\033[?25h\033[?1049l"
+
+
+class WatchedState:
+    """The parsed file and its metrics, updated in place on each change."""
+
+    def __init__(self, filepath, goals, show_full_history=False):
+        self.filepath = filepath
+        self.goals = goals
+        self.show_full_history = show_full_history
+        self.store = WeekStore()
+        self.point = None
+        self.metrics = {}
+        self.patterns = {}
+        self.reload()
+
+    def reload(self):
+        """Re-parse the changed tail; True if anything shown may differ."""
+        with open(self.filepath, "rb") as f:
+            data = f.read()
+        n = len(self.store)
+        before = self.last_week()
+
+        if can_resume(data, self.point):
+            store = self.store
+            habits = list(store.habits)
+            store.truncate(n - 1)
+            last_header = store.parse_into(data, self.point["offset"])
+        else:
+            store = self.store = WeekStore()
+            habits = None
+            last_header = store.parse_into(data)
+        self.point = resume_point(data, last_header)
+
+        # Only the last week was re-parsed: just its changed habits moved
+        hids = None
+        same_weeks = habits is not None and len(store) == n
+        if same_weeks and store.habits[: len(habits)] == habits:
+            after = self.last_week()
+            hids = [
+                hid for hid, h in enumerate(store.habits) if after[h] != before.get(h)
+            ]
+            if not hids:
+                return False
+
+        fresh = compute_metrics(store, self.goals, hids=hids)
+        if hids is not None:
+            fresh = {h: fresh.get(h, self.metrics.get(h)) for h in store.habits}
+        self.metrics = fresh
+        self.patterns = learn_patterns(store) if len(store) else {}
+        return True
+
+    def last_week(self):
+        """{habit: (mask, ndays, total)} in the latest week."""
+        s = self.store
+        if not len(s):
+            return {}
+        return {
+            h: (s.masks[hid][-1], s.ndays[hid][-1], s.totals[hid][-1])
+            for hid, h in enumerate(s.habits)
+        }
+
+    def render(self, today):
+        return render_dashboard(
+            self.store,
+            self.metrics,
+            self.patterns,
+            self.goals,
+            today,
+            self.show_full_history,
+        )
+
+
+class Screen:
+    """The lines on the terminal, repainted by diff against the last frame."""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.lines = None  # Unknown: the next paint redraws everything
+
+    def invalidate(self):
+        self.lines = None
+
+    def paint(self, text):
+        rows = get_terminal_size().lines
+        lines = text.rstrip("\n").split("\n")[:rows]
+        old = self.lines
+        out = ["\033[H\033[2J"] if old is None else []
+        for i, line in enumerate(lines):
+            if old is None or i >= len(old) or old[i] != line:
+                out.append(f"\033[{i + 1};1H{line}\033[K")
+        if old is not None and len(lines) < len(old):
+            out.append(f"\033[{len(lines) + 1};1H\033[J")
+        self.lines = lines
+        if out:
+            write_frame("".join(out), self.stream)
+
+
+def seconds_to_midnight(now):
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return (midnight - now).total_seconds()
+
+
+def watch(filepath, goals, show_full_history=False):
+    """Show the dashboard until interrupted, repainting on change and at 00:00."""
+    state = WatchedState(filepath, goals, show_full_history)
+    watcher = FileWatcher(filepath)
+    screen = Screen()
+
+    # SIGWINCH wakes select() through a pipe; the next paint redraws fully
+    wake_r, wake_w = os.pipe()
+    os.set_blocking(wake_r, False)
+    os.set_blocking(wake_w, False)
+    old_wakeup = signal.set_wakeup_fd(wake_w)
+    old_winch = signal.signal(signal.SIGWINCH, lambda *_: None)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    write_frame(ENTER_SCREEN)
+    try:
+        today = datetime.now()
+        screen.paint(state.render(today))
+        while True:
+            timeout = min(seconds_to_midnight(datetime.now()) + 0.01, MAX_SLEEP)
+            if watcher.fd is None:
+                timeout = min(timeout, POLL_INTERVAL)
+            waiting = [wake_r] if watcher.fd is None else [wake_r, watcher]
+            readable, _, _ = select.select(waiting, [], [], timeout)
+
+            dirty = False
+            if wake_r in readable:
+                try:
+                    while os.read(wake_r, 512):
+                        pass
+                except BlockingIOError:
+                    pass
+                screen.invalidate()
+                dirty = True
+            if (watcher in readable or watcher.fd is None) and watcher.changed():
+                if os.path.exists(filepath):
+                    dirty = state.reload() or dirty
+            now = datetime.now()
+            if now.date() != today.date():
+                dirty = True
+            if dirty:
+                today = now
+                screen.paint(state.render(today))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        write_frame(LEAVE_SCREEN)
+        signal.set_wakeup_fd(old_wakeup)
+        signal.signal(signal.SIGWINCH, old_winch)
+        os.close(wake_r)
+        os.close(wake_w)
+        watcher.close()